@@ -2,18 +2,29 @@
 FastAPI Server for Church Media Automation System
 """
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
-import sys
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict
+import orjson
+from typing import AsyncIterator, Optional, Dict, Any, List
+import asyncio
+import hashlib
+import json
 import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent))
+import requests
+import yaml
 
 from controller.event_manager import EventManager
+from controller.state_store import AsyncStateWriter
 from controller.workflow_controller import WorkflowController
 from utils.dependency_manager import DependencyManager
 
@@ -21,10 +32,53 @@ from utils.dependency_manager import DependencyManager
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Managers are created once per process in the lifespan hook below
+event_manager: EventManager
+workflow_controller: WorkflowController
+dependency_manager: DependencyManager
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build shared managers and size the thread pool for the app's lifetime"""
+    global event_manager, workflow_controller, dependency_manager
+
+    event_manager = EventManager()
+    workflow_controller = WorkflowController()
+    dependency_manager = DependencyManager()
+
+    # Also expose them on app.state for callers that have a Request
+    app.state.event_manager = event_manager
+    app.state.workflow_controller = workflow_controller
+    app.state.dependency_manager = dependency_manager
+
+    # Dedicated executor for the asyncio.to_thread offloads; the default
+    # pool is too small once many events are loaded concurrently
+    executor = ThreadPoolExecutor(
+        max_workers=(os.cpu_count() or 1) * 4,
+        thread_name_prefix="cmas-worker"
+    )
+    asyncio.get_running_loop().set_default_executor(executor)
+
+    # Batch module-result writes from the workflow worker thread
+    state_writer = AsyncStateWriter(workflow_controller.state_store)
+    await state_writer.start()
+    workflow_controller.state_store.writer = state_writer
+
+    try:
+        yield
+    finally:
+        workflow_controller.state_store.writer = None
+        await state_writer.stop()
+        executor.shutdown(wait=False)
+
+
 app = FastAPI(
     title="Church Media Automation System",
     description="API for automated church media processing",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -36,14 +90,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize managers
-event_manager = EventManager()
-workflow_controller = WorkflowController()
-dependency_manager = DependencyManager()
-
 
 # Pydantic models
-class EventCreate(BaseModel):
+class APIModel(BaseModel):
+    """Base for request bodies: drop unknown fields, compile once, stay immutable"""
+    model_config = ConfigDict(extra='ignore', frozen=True)
+
+
+class EventCreate(APIModel):
     title: str
     speaker: str
     series: Optional[str] = None
@@ -69,68 +123,216 @@ class EventCreate(BaseModel):
     modules: Optional[Dict[str, Any]] = None
 
 
-class VideoAttach(BaseModel):
+class VideoAttach(APIModel):
     video_path: str
 
 
-class WorkflowRun(BaseModel):
+class WorkflowRun(APIModel):
     force: bool = False
 
 
-class ModuleRun(BaseModel):
+class ModuleRun(APIModel):
     input_files: Optional[Dict[str, str]] = None
     force: bool = False
 
 
+class BatchRequestItem(APIModel):
+    method: str = "GET"
+    path: str
+    body: Optional[Dict[str, Any]] = None
+
+
+class BatchRequest(APIModel):
+    requests: Dict[str, BatchRequestItem]
+
+
+async def _dispatch_in_process(method: str, path: str, body: Optional[Dict]) -> Dict:
+    """Run one sub-request through the ASGI app without touching a socket"""
+    payload = orjson.dumps(body) if body is not None else b""
+    path, _, query = path.partition('?')
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": method.upper(),
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("batch", 0),
+    }
+
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if body_sent:
+            return {"type": "http.disconnect"}
+        body_sent = True
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    status_code = 500
+    chunks = []
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+
+    raw = b"".join(chunks)
+    try:
+        data = orjson.loads(raw) if raw else None
+    except orjson.JSONDecodeError:
+        data = raw.decode('utf-8', 'replace')
+
+    return {"status_code": status_code, "body": data}
+
+
+@app.post('/api/batch')
+async def batch_gateway(batch: BatchRequest):
+    """Coalesce several API calls into one round-trip
+
+    The UI posts {"requests": {key: {"method", "path", "body"}}} and gets
+    back {"responses": {key: {"status_code", "body"}}}. Sub-requests are
+    dispatched in-process and gathered concurrently, so N UI calls cost
+    one TCP/HTTP cycle instead of N. Sub-requests may not target the
+    gateway itself: a batch item pointing back at /api/batch would
+    recurse without bound, so it is rejected instead of dispatched.
+    """
+
+    async def dispatch(item: BatchRequestItem) -> Dict:
+        path = item.path.partition('?')[0].rstrip('/')
+        if path == '/api/batch':
+            return {
+                'status_code': 400,
+                'body': {'detail': 'Batch sub-requests may not target /api/batch'}
+            }
+        return await _dispatch_in_process(item.method, item.path, item.body)
+
+    keys = list(batch.requests.keys())
+    results = await asyncio.gather(*(
+        dispatch(item) for item in batch.requests.values()
+    ))
+    return {'responses': dict(zip(keys, results))}
+
+
 @app.get('/api/status')
 async def get_status():
     """Get system status"""
-    deps = dependency_manager.check_all()
+    deps = await asyncio.to_thread(dependency_manager.check_all)
     return {
         'status': 'ok',
         'dependencies': deps
     }
 
 
+async def _stream_json_array(items) -> AsyncIterator[bytes]:
+    """Serialize an async iterator of dicts as a streamed JSON array"""
+    yield b"["
+    first = True
+    async for item in items:
+        if first:
+            first = False
+        else:
+            yield b","
+        yield orjson.dumps(item)
+    yield b"]"
+
+
+def _event_etag_part(event_id: str, state: Optional[Dict]) -> bytes:
+    """Stat-only fingerprint for one event: config mtime + state timestamp"""
+    try:
+        mtime_ns = (event_manager.events_dir / event_id / "event.json").stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = 0
+    updated = state.get('completed_at', '') if state else ''
+    return f'{event_id}:{mtime_ns}:{updated};'.encode()
+
+
 @app.get('/api/events')
-async def list_events():
+async def list_events(request: Request):
     """List all events"""
     event_ids = event_manager.list_events()
-    events = []
-    
-    for event_id in event_ids:
-        event = event_manager.load_event(event_id)
-        if event:
+
+    # One query for every workflow state instead of one lookup per event
+    states = await workflow_controller.state_store.get_all_workflow_states()
+
+    # Conditional GET: dashboards poll this endpoint continuously, so a
+    # stat-derived ETag lets the "nothing changed" case return 304
+    hasher = hashlib.blake2b(digest_size=16)
+    for event_id in sorted(event_ids):
+        hasher.update(_event_etag_part(event_id, states.get(event_id)))
+    etag = hasher.hexdigest()
+
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304)
+
+    # Bound concurrency so a large events directory can't exhaust FDs
+    semaphore = asyncio.Semaphore(32)
+
+    async def load_one(event_id):
+        async with semaphore:
+            event = await asyncio.to_thread(event_manager.load_event, event_id)
+            if not event:
+                return None
             # Add status field (check workflow state)
-            state = workflow_controller.state_store.get_workflow_state(event_id)
+            state = states.get(event_id)
             event['status'] = state['overall_status'] if state else 'pending'
-            events.append(event)
-    
-    return events
+            return event
+
+    async def gen():
+        # Launch all loads up front, then flush each event as soon as it
+        # is ready instead of buffering the whole list in memory
+        tasks = [asyncio.ensure_future(load_one(event_id)) for event_id in event_ids]
+        for task in tasks:
+            event = await task
+            if event:
+                yield event
+
+    return StreamingResponse(
+        _stream_json_array(gen()),
+        media_type='application/json',
+        headers={'ETag': etag}
+    )
 
 
 @app.get('/api/events/{event_id}')
-async def get_event(event_id: str):
+async def get_event(event_id: str, request: Request):
     """Get specific event"""
     event = event_manager.load_event(event_id)
     if not event:
         raise HTTPException(status_code=404, detail='Event not found')
-    
+
     # Add workflow state
-    state = workflow_controller.state_store.get_workflow_state(event_id)
+    state = await workflow_controller.state_store.get_workflow_state(event_id)
+
+    etag = hashlib.blake2b(_event_etag_part(event_id, state), digest_size=16).hexdigest()
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304)
+
     event['workflow_state'] = state
-    
+
     # Add input_video flag
     event['input_video'] = len(event.get('inputs', {}).get('video_files', [])) > 0
-    
-    return event
+
+    return ORJSONResponse(event, headers={'ETag': etag})
 
 
 @app.post('/api/events', status_code=status.HTTP_201_CREATED)
 async def create_event(event_data: EventCreate):
     """Create new event"""
     try:
-        event_id = event_manager.create_event(
+        event = event_manager.create_event(
             title=event_data.title,
             speaker=event_data.speaker,
             series=event_data.series,
@@ -155,8 +357,6 @@ async def create_event(event_data: EventCreate):
             thumbnail_settings=event_data.thumbnail_settings,
             modules=event_data.modules
         )
-        
-        event = event_manager.load_event(event_id)
         return event
     
     except Exception as e:
@@ -173,9 +373,6 @@ async def update_event_config(event_id: str, config_data: Dict[str, Any]):
             raise HTTPException(status_code=404, detail='Event not found')
         
         # Update config file
-        from pathlib import Path
-        import json
-        
         event_dir = Path("events") / event_id
         config_file = event_dir / "event.json"
         
@@ -250,12 +447,12 @@ async def attach_video(event_id: str, video_data: VideoAttach):
 @app.get('/api/dependencies')
 async def check_dependencies():
     """Check all dependencies"""
-    results = dependency_manager.check_all()
-    
+    results = await asyncio.to_thread(dependency_manager.check_all)
+
     # Add Ollama model check
     ollama_installed = results.get('ollama', {}).get('installed', False)
     if ollama_installed:
-        ollama_models = dependency_manager.check_ollama_models()
+        ollama_models = await asyncio.to_thread(dependency_manager.check_ollama_models)
         results['ollama']['models'] = ollama_models
     
     return results
@@ -265,8 +462,11 @@ async def check_dependencies():
 async def install_dependency(dep_key: str):
     """Install a dependency"""
     try:
-        success = dependency_manager.install_dependency(dep_key, auto_confirm=True)
+        success = await asyncio.to_thread(dependency_manager.install_dependency, dep_key, True)
         if success:
+            # Refresh the dependency caches now that the system changed
+            dependency_manager.invalidate_dependency(dep_key)
+            await asyncio.to_thread(dependency_manager.check_all, True)
             return {'message': f'{dep_key} installed successfully'}
         else:
             raise HTTPException(status_code=400, detail='Installation failed')
@@ -284,39 +484,38 @@ async def configure_custom_path(dep_key: str, path_data: dict):
         raise HTTPException(status_code=400, detail='Path is required')
     
     try:
-        # Use the dependency manager's configure method
-        import yaml
-        from pathlib import Path
-        import os
-        import subprocess
-        
         # Validate path exists
         if not os.path.exists(custom_path):
             raise HTTPException(status_code=400, detail=f'Path does not exist: {custom_path}')
-        
-        # Test the executable
+
+        # Test the executable without blocking the event loop
         try:
-            result = subprocess.run(
-                [custom_path, '--help'],
-                capture_output=True,
-                text=True,
-                timeout=5
+            proc = await asyncio.create_subprocess_exec(
+                custom_path, '--help',
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
             )
-            if result.returncode != 0:
+            try:
+                returncode = await asyncio.wait_for(proc.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                proc.kill()
+                raise HTTPException(status_code=400, detail='Executable test timed out')
+            if returncode != 0:
                 raise HTTPException(status_code=400, detail='Executable test failed')
-        except subprocess.TimeoutExpired:
-            raise HTTPException(status_code=400, detail='Executable test timed out')
-        except FileNotFoundError:
+        except (FileNotFoundError, PermissionError):
             raise HTTPException(status_code=400, detail='File is not executable')
-        
+
         # Update config file
         config_path = Path('config/config.yaml')
         if not config_path.exists():
             raise HTTPException(status_code=500, detail='Config file not found')
-        
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f) or {}
-        
+
+        def _read_config():
+            with open(config_path, 'r') as f:
+                return yaml.safe_load(f) or {}
+
+        config = await asyncio.to_thread(_read_config)
+
         if dep_key == 'whisper.cpp':
             if 'modules' not in config:
                 config['modules'] = {}
@@ -328,9 +527,15 @@ async def configure_custom_path(dep_key: str, path_data: dict):
             config['modules']['subtitles']['whispercpp']['custom_path'] = custom_path
             config['modules']['subtitles']['whispercpp']['whisper_bin'] = custom_path
         
-        with open(config_path, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False, sort_keys=False)
-        
+        def _write_config():
+            with open(config_path, 'w') as f:
+                yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+
+        await asyncio.to_thread(_write_config)
+
+        # Refresh the dependency cache now that the configuration changed
+        await asyncio.to_thread(dependency_manager.check_all, True)
+
         return {'message': 'Custom path configured successfully', 'path': custom_path}
     
     except HTTPException:
@@ -360,8 +565,6 @@ async def check_dependency(dep_key: str):
 @app.post('/api/events/{event_id}/workflow/run')
 async def run_workflow(event_id: str, workflow_data: WorkflowRun):
     """Run workflow for an event"""
-    import threading
-    
     # Check if event exists
     event = event_manager.load_event(event_id)
     if not event:
@@ -403,7 +606,7 @@ async def get_workflow_progress(event_id: str):
     
     if not progress:
         # No progress yet, check if completed
-        state = workflow_controller.state_store.get_workflow_state(event_id)
+        state = await workflow_controller.state_store.get_workflow_state(event_id)
         if state and state.get('overall_status') == 'completed':
             return {
                 'status': 'completed',
@@ -427,8 +630,6 @@ async def get_workflow_progress(event_id: str):
 @app.post('/api/events/{event_id}/modules/{module_name}/run')
 async def run_single_module(event_id: str, module_name: str, module_data: ModuleRun):
     """Run a single module independently"""
-    import threading
-    
     # Check if event exists
     event = event_manager.load_event(event_id)
     if not event:
@@ -491,7 +692,7 @@ async def list_event_modules(event_id: str):
         module_name = module['name']
         
         # Get execution status
-        result = workflow_controller.state_store.get_module_result(event_id, module_name)
+        result = await workflow_controller.state_store.get_module_result(event_id, module_name)
         if result:
             module['status'] = result.get('status', 'unknown')
             module['last_run'] = result.get('timestamp', None)
@@ -514,9 +715,6 @@ async def list_event_modules(event_id: str):
 async def get_whisper_models():
     """Get available Whisper models"""
     try:
-        from pathlib import Path
-        import yaml
-        
         models_list = []
         
         # Check default models directory
@@ -568,8 +766,6 @@ async def get_whisper_models():
 async def get_ollama_models():
     """Get available Ollama models"""
     try:
-        import requests
-        
         response = requests.get('http://localhost:11434/api/tags', timeout=5)
         
         if response.status_code == 200:
@@ -621,8 +817,6 @@ async def get_ollama_models():
 async def get_ollama_image_models():
     """Get available Ollama image generation models"""
     try:
-        import requests
-        
         response = requests.get('http://localhost:11434/api/tags', timeout=5)
         
         if response.status_code == 200:
@@ -724,12 +918,12 @@ async def list_assets(asset_type: str):
 
 # ComfyUI Integration Endpoints
 
-class ComfyUIConfig(BaseModel):
+class ComfyUIConfig(APIModel):
     server_url: str
     workflow_template: Optional[str] = None
 
 
-class ComfyUIGenerateRequest(BaseModel):
+class ComfyUIGenerateRequest(APIModel):
     prompt: str
     width: int = 1280
     height: int = 720
@@ -766,9 +960,7 @@ async def generate_with_comfyui(request: ComfyUIGenerateRequest):
     """Generate image using ComfyUI"""
     try:
         from modules.thumbnail.ai_generator_comfyui import ComfyUIGenerator
-        import tempfile
-        import time
-        
+
         # Use provided server_url or default from config
         server_url = request.server_url or "http://127.0.0.1:8188"
         
@@ -818,8 +1010,6 @@ async def generate_with_comfyui(request: ComfyUIGenerateRequest):
 async def get_comfyui_config():
     """Get ComfyUI configuration from config.yaml"""
     try:
-        import yaml
-        
         config_path = Path("config/config.yaml")
         if not config_path.exists():
             raise HTTPException(status_code=404, detail="Configuration file not found")
@@ -845,8 +1035,6 @@ async def get_comfyui_config():
 async def update_comfyui_config(config: ComfyUIConfig):
     """Update ComfyUI configuration"""
     try:
-        import yaml
-        
         config_path = Path("config/config.yaml")
         if not config_path.exists():
             raise HTTPException(status_code=404, detail="Configuration file not found")
@@ -882,5 +1070,19 @@ async def update_comfyui_config(config: ComfyUIConfig):
 
 if __name__ == '__main__':
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=5001)
+    # uvloop + httptools replace the default asyncio loop and h11 parser.
+    # Workers default to 1: progress polling (StateStore._progress_cache)
+    # and the run_workflow "already running" guard are per-process, so
+    # extra workers serve stale progress and miss runs started elsewhere
+    # — and each one duplicates the engine caches and whisper-server.
+    # WEB_CONCURRENCY stays as an explicit opt-in for deployments that
+    # have made that state cross-process.
+    uvicorn.run(
+        "api_server:app",
+        host="0.0.0.0",
+        port=5001,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", 1))
+    )
 
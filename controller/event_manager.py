@@ -5,7 +5,7 @@ Event Manager - Create, load, and update events
 import json
 import os
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 
 
@@ -15,6 +15,7 @@ class EventManager:
     def __init__(self, events_dir: str = "events"):
         self.events_dir = Path(events_dir)
         self.events_dir.mkdir(exist_ok=True)
+        self._event_cache = {}  # event_id -> (mtime_ns, parsed config)
     
     def create_event(
         self,
@@ -43,7 +44,7 @@ class EventManager:
         comfyui_steps: int = 9,
         thumbnail_settings: Optional[Dict[str, Any]] = None,
         modules: Optional[Dict[str, bool]] = None
-    ) -> str:
+    ) -> Dict:
         """
         Create a new event with the specified configuration
         
@@ -73,9 +74,10 @@ class EventManager:
             comfyui_steps: Sampling steps for ComfyUI
             thumbnail_settings: Thumbnail composition settings (fonts, sizes, elements, images)
             modules: Module toggle configuration (optional)
-            
+
         Returns:
-            event_id: Generated event identifier
+            The full event configuration dict (including "event_id"),
+            so callers don't need to reload what was just written
         """
         # Generate event ID
         if not date:
@@ -157,17 +159,29 @@ class EventManager:
         config_file = event_path / "event.json"
         with open(config_file, 'w', encoding='utf-8') as f:
             json.dump(event_config, f, indent=2, ensure_ascii=False)
-        
-        return event_id
+
+        self._event_cache[event_id] = (config_file.stat().st_mtime_ns, dict(event_config))
+
+        return event_config
     
     def load_event(self, event_id: str) -> Optional[Dict]:
-        """Load event configuration from disk"""
+        """Load event configuration (cached while the file is unchanged)"""
         event_path = self.events_dir / event_id / "event.json"
-        if not event_path.exists():
+        try:
+            mtime_ns = event_path.stat().st_mtime_ns
+        except FileNotFoundError:
             return None
-        
+
+        cached = self._event_cache.get(event_id)
+        if cached and cached[0] == mtime_ns:
+            # Shallow copy so callers can annotate (status, workflow_state)
+            # without polluting the cache
+            return dict(cached[1])
+
         with open(event_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            config = json.load(f)
+        self._event_cache[event_id] = (mtime_ns, config)
+        return dict(config)
     
     def update_event(self, event_id: str, updates: Dict) -> bool:
         """
@@ -192,7 +206,10 @@ class EventManager:
         event_path = self.events_dir / event_id / "event.json"
         with open(event_path, 'w', encoding='utf-8') as f:
             json.dump(event_config, f, indent=2, ensure_ascii=False)
-        
+
+        # Write-through so subsequent loads skip the disk read
+        self._event_cache[event_id] = (event_path.stat().st_mtime_ns, dict(event_config))
+
         return True
     
     def add_video_input(self, event_id: str, video_path: str) -> bool:
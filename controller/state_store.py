@@ -2,23 +2,224 @@
 State Store - Saves run state (JSON/SQLite)
 """
 
+import asyncio
 import json
+import logging
+import os
+import sqlite3
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, Optional
 from datetime import datetime
 
+import aiofiles
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncStateWriter:
+    """Debounces bursts of module-result saves into one flush window
+
+    Module completions can arrive in quick succession; instead of one
+    file write per completion, writes are queued and drained in batches
+    (up to max_batch_size per window seconds), with only the latest
+    result kept per (event, module) pair.
+    """
+
+    def __init__(self, store: "StateStore", max_batch_size: int = 16, window: float = 0.05):
+        self.store = store
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._queue = None
+        self._task = None
+        self._loop = None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._drain())
+
+    async def stop(self) -> None:
+        """Flush pending writes and stop the drain task"""
+        if not self.is_running:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def enqueue_threadsafe(self, event_id: str, module_name: str, result: Dict) -> None:
+        """Queue a save from any thread (used by the workflow worker)"""
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (event_id, module_name, result))
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    await self._flush(batch)
+                    return
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch) -> None:
+        # Last write wins per (event, module); a rapid re-run only hits
+        # disk once per window
+        latest = {}
+        for event_id, module_name, result in batch:
+            latest[(event_id, module_name)] = result
+
+        for (event_id, module_name), result in latest.items():
+            try:
+                await self.store.save_module_result(event_id, module_name, result)
+            except Exception as e:
+                logger.warning(f"Batched save for {event_id}/{module_name} failed: {e}")
+
+
+class ModuleResultBatch:
+    """Write-through recorder for one event's module results
+
+    Each result is persisted the moment it arrives: a crash mid-run
+    loses at most the module still executing, and readers (including
+    the controller hashing upstream results for its dependents) see
+    completed work immediately. The accumulated `results` dict lets
+    the caller rewrite the aggregate workflow state once per run
+    instead of once per module completion.
+    """
+
+    def __init__(self, store: "StateStore", event_id: str):
+        self.store = store
+        self.event_id = event_id
+        self.results: Dict[str, Dict] = {}
+
+    def save_module_result(self, module_name: str, result: Dict) -> None:
+        self.results[module_name] = result
+        asyncio.run(self.store.save_module_result(self.event_id, module_name, result))
+
 
 class StateStore:
     """Persists workflow execution state"""
-    
+
     def __init__(self, events_dir: str = "events"):
         self.events_dir = Path(events_dir)
         self._progress_cache = {}  # In-memory progress cache
-    
-    def save_module_result(self, event_id: str, module_name: str, result: Dict) -> None:
+        self._db_path = self.events_dir / "states.sqlite"
+        self._init_db()
+        # Optional AsyncStateWriter installed by the API server lifespan;
+        # when present, worker-thread saves are batched through it
+        self.writer = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with WAL enabled (one per operation; connections
+        are not shared across the API threads and the workflow thread)"""
+        conn = sqlite3.connect(self._db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _init_db(self) -> None:
+        self.events_dir.mkdir(exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS states ("
+                "event_id TEXT PRIMARY KEY, "
+                "overall_status TEXT, "
+                "updated_at TEXT, "
+                "payload BLOB)"
+            )
+            self._backfill_legacy_states(conn)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _backfill_legacy_states(self, conn: sqlite3.Connection) -> None:
+        """Import pre-SQLite states so list reads need no fallback
+
+        Events processed before the SQLite switch kept their state in
+        logs/workflow_state.json; without a row here the bulk read used
+        by the event list reported them as pending while the per-event
+        read (which does fall back) showed the real status. Rows win
+        over legacy files, so this is one directory scan at startup
+        and a no-op once every legacy event has been imported.
+        """
+        existing = {row[0] for row in conn.execute("SELECT event_id FROM states")}
+        try:
+            entries = list(os.scandir(self.events_dir))
+        except OSError:
+            return
+        for entry in entries:
+            if not entry.is_dir() or entry.name in existing:
+                continue
+            state_file = Path(entry.path) / "logs" / "workflow_state.json"
+            try:
+                with open(state_file, 'rb') as f:
+                    state = orjson.loads(f.read())
+            except FileNotFoundError:
+                continue
+            except (OSError, orjson.JSONDecodeError) as e:
+                logger.warning("Skipping unreadable legacy state for %s: %s", entry.name, e)
+                continue
+            conn.execute(
+                "INSERT OR IGNORE INTO states (event_id, overall_status, updated_at, payload) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    entry.name,
+                    state.get("overall_status"),
+                    state.get("completed_at"),
+                    orjson.dumps(state)
+                )
+            )
+
+    def _write_state_row(self, event_id: str, state: Dict) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO states (event_id, overall_status, updated_at, payload) "
+                "VALUES (?, ?, ?, ?)",
+                (event_id, state["overall_status"], state["completed_at"], orjson.dumps(state))
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _read_state_row(self, event_id: str) -> Optional[Dict]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT payload FROM states WHERE event_id = ?", (event_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return orjson.loads(row[0]) if row else None
+
+    def _read_all_state_rows(self) -> Dict[str, Dict]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT event_id, payload FROM states").fetchall()
+        finally:
+            conn.close()
+        return {event_id: orjson.loads(payload) for event_id, payload in rows}
+
+    async def save_module_result(self, event_id: str, module_name: str, result: Dict) -> None:
         """
         Save the result of a module execution
-        
+
         Args:
             event_id: Event identifier
             module_name: Name of the module
@@ -27,36 +228,51 @@ class StateStore:
         event_path = self.events_dir / event_id
         if not event_path.exists():
             raise ValueError(f"Event directory not found: {event_id}")
-        
+
         # Save to logs directory
         result_file = event_path / "logs" / f"{module_name}_result.json"
         result["saved_at"] = datetime.now().isoformat()
-        
-        with open(result_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
-    
-    def get_module_result(self, event_id: str, module_name: str) -> Optional[Dict]:
+
+        await self._write_json_atomic(result_file, result)
+
+    @staticmethod
+    async def _write_json_atomic(path: Path, data: Dict) -> None:
+        """Serialize with orjson and publish via atomic rename
+
+        A crash mid-write leaves the previous file intact; readers never
+        see torn JSON.
+        """
+        payload = orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        )
+        tmp_path = path.with_suffix('.json.tmp')
+        async with aiofiles.open(tmp_path, 'wb') as f:
+            await f.write(payload)
+        os.replace(tmp_path, path)
+
+    async def get_module_result(self, event_id: str, module_name: str) -> Optional[Dict]:
         """
         Retrieve the result of a previous module execution
-        
+
         Args:
             event_id: Event identifier
             module_name: Name of the module
-            
+
         Returns:
             Module result dictionary or None if not found
         """
         result_file = self.events_dir / event_id / "logs" / f"{module_name}_result.json"
         if not result_file.exists():
             return None
-        
-        with open(result_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    
-    def save_workflow_state(self, event_id: str, results: Dict) -> None:
+
+        async with aiofiles.open(result_file, 'rb') as f:
+            return orjson.loads(await f.read())
+
+    async def save_workflow_state(self, event_id: str, results: Dict) -> None:
         """
         Save the overall workflow execution state
-        
+
         Args:
             event_id: Event identifier
             results: Dictionary of all module results
@@ -64,40 +280,97 @@ class StateStore:
         event_path = self.events_dir / event_id
         if not event_path.exists():
             raise ValueError(f"Event directory not found: {event_id}")
-        
-        state_file = event_path / "logs" / "workflow_state.json"
+
         state = {
             "event_id": event_id,
             "completed_at": datetime.now().isoformat(),
             "module_results": results,
             "overall_status": self._compute_overall_status(results)
         }
-        
-        with open(state_file, 'w', encoding='utf-8') as f:
-            json.dump(state, f, indent=2, ensure_ascii=False)
-    
-    def get_workflow_state(self, event_id: str) -> Optional[Dict]:
+
+        await asyncio.to_thread(self._write_state_row, event_id, state)
+
+    @staticmethod
+    def _to_frontend_state(state: Dict) -> Dict:
+        """Rename module_results to modules for frontend compatibility"""
+        if "module_results" in state:
+            state["modules"] = state.pop("module_results")
+        return state
+
+    async def get_workflow_state(self, event_id: str) -> Optional[Dict]:
         """Retrieve overall workflow state"""
+        state = await asyncio.to_thread(self._read_state_row, event_id)
+        if state is not None:
+            return self._to_frontend_state(state)
+
+        # Legacy fallback: events recorded before the SQLite store kept
+        # their state in logs/workflow_state.json
         state_file = self.events_dir / event_id / "logs" / "workflow_state.json"
-        if not state_file.exists():
-            return {
-                "event_id": event_id,
-                "overall_status": "pending",
-                "modules": {}
-            }
-        
-        with open(state_file, 'r', encoding='utf-8') as f:
-            state = json.load(f)
-            # Rename module_results to modules for frontend compatibility
-            if "module_results" in state:
-                state["modules"] = state.pop("module_results")
-            return state
-    
+        if state_file.exists():
+            async with aiofiles.open(state_file, 'rb') as f:
+                return self._to_frontend_state(orjson.loads(await f.read()))
+
+        return {
+            "event_id": event_id,
+            "overall_status": "pending",
+            "modules": {}
+        }
+
+    async def get_all_workflow_states(self) -> Dict[str, Dict]:
+        """Fetch every stored workflow state in a single query
+
+        Used by the event list endpoint to avoid one lookup per event.
+        Events without a row are simply absent from the result.
+        """
+        states = await asyncio.to_thread(self._read_all_state_rows)
+        return {event_id: self._to_frontend_state(state) for event_id, state in states.items()}
+
+    @contextmanager
+    def batch(self, event_id: str):
+        """Group the module-result saves of one workflow run
+
+        What the batch coalesces is the aggregate state: per-module
+        results are still written through (and fsynced via
+        _write_json_atomic) as each module finishes — deferring them
+        would lose completed work on a crash and hide fresh upstream
+        results from dependents that hash them — but the workflow-state
+        rewrite happens once per run, from the batch's collected
+        results, instead of once per completion.
+        """
+        yield ModuleResultBatch(self, event_id)
+
+    # Blocking wrappers for callers that run outside the event loop
+    # (the workflow worker thread and the CLI).
+
+    def save_module_result_sync(self, event_id: str, module_name: str, result: Dict) -> None:
+        """Blocking variant of save_module_result
+
+        Routes through the AsyncStateWriter when one is running so bursts
+        of module completions coalesce into batched writes.
+        """
+        writer = self.writer
+        if writer is not None and writer.is_running:
+            writer.enqueue_threadsafe(event_id, module_name, result)
+            return
+        asyncio.run(self.save_module_result(event_id, module_name, result))
+
+    def get_module_result_sync(self, event_id: str, module_name: str) -> Optional[Dict]:
+        """Blocking variant of get_module_result"""
+        return asyncio.run(self.get_module_result(event_id, module_name))
+
+    def save_workflow_state_sync(self, event_id: str, results: Dict) -> None:
+        """Blocking variant of save_workflow_state"""
+        asyncio.run(self.save_workflow_state(event_id, results))
+
+    def get_workflow_state_sync(self, event_id: str) -> Optional[Dict]:
+        """Blocking variant of get_workflow_state"""
+        return asyncio.run(self.get_workflow_state(event_id))
+
     def save_progress(self, event_id: str, progress_data: Dict) -> None:
         """Save current workflow progress (in-memory and file)"""
         # Cache in memory for fast access
         self._progress_cache[event_id] = progress_data
-        
+
         # Also save to file
         event_path = self.events_dir / event_id
         if event_path.exists():
@@ -105,13 +378,13 @@ class StateStore:
             progress_data["updated_at"] = datetime.now().isoformat()
             with open(progress_file, 'w', encoding='utf-8') as f:
                 json.dump(progress_data, f, indent=2, ensure_ascii=False)
-    
+
     def get_progress(self, event_id: str) -> Optional[Dict]:
         """Get current workflow progress"""
         # Check memory cache first
         if event_id in self._progress_cache:
             return self._progress_cache[event_id]
-        
+
         # Try loading from file
         progress_file = self.events_dir / event_id / "logs" / "progress.json"
         if progress_file.exists():
@@ -119,37 +392,47 @@ class StateStore:
                 progress = json.load(f)
                 self._progress_cache[event_id] = progress
                 return progress
-        
+
         return None
-    
+
     def clear_progress(self, event_id: str) -> None:
         """Clear progress data for an event"""
         if event_id in self._progress_cache:
             del self._progress_cache[event_id]
-    
+
     def _compute_overall_status(self, results: Dict) -> str:
         """
         Compute overall workflow status from module results
-        
+
         Returns:
             One of: "pending", "processing", "completed", "failed"
         """
         if not results:
             return "pending"
-        
-        statuses = [r.get("status", "unknown") for r in results.values()]
-        
-        # If any module is running, overall is processing
-        if any(s == "running" for s in statuses):
-            return "processing"
-        
+
+        # Single pass with counters instead of building a status list and
+        # scanning it up to three times
+        total = 0
+        succeeded = 0
+        failed = 0
+        for r in results.values():
+            status = r.get("status", "unknown")
+            # If any module is running, overall is processing
+            if status == "running":
+                return "processing"
+            total += 1
+            if status in ("success", "skipped"):
+                succeeded += 1
+            elif status == "failed":
+                failed += 1
+
         # If all modules succeeded, overall is completed
-        if all(s in ["success", "skipped"] for s in statuses):
+        if succeeded == total:
             return "completed"
-        
+
         # If any failed, overall is failed
-        if any(s == "failed" for s in statuses):
+        if failed:
             return "failed"
-        
+
         # Default to pending
         return "pending"
@@ -2,31 +2,141 @@
 Workflow Controller - Orchestrates modules, queue, and retries
 """
 
+import hashlib
 import json
 import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+import requests
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from controller.event_manager import EventManager
 from controller.state_store import StateStore
 
+_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        """Pretty-print a result dict (orjson when available)"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        """Pretty-print a result dict (stdlib fallback)"""
+        return json.dumps(obj, indent=2, default=str)
+
 
 class WorkflowController:
     """Main orchestrator for the Church Media Automation System"""
-    
+
+    # Data dependencies between modules. A module is dispatched once all of
+    # its enabled dependencies have finished (whatever their status —
+    # modules have their own fallbacks, e.g. thumbnail_compose falls back
+    # to an asset background when thumbnail_ai fails). Modules without an
+    # entry have no dependencies and run immediately.
+    MODULE_DEPS: Dict[str, Set[str]] = {
+        "subtitle_correction": {"subtitles"},
+        "content_summary": {"subtitles", "subtitle_correction"},
+        "thumbnail_ai": {"content_summary"},
+        "thumbnail_compose": {"thumbnail_ai"},
+        "ai_content": {"subtitles"},
+        "publish_youtube": {"subtitles", "thumbnail_compose"},
+        "publish_website": {"content_summary", "thumbnail_compose"},
+        "archive": {"publish_youtube", "publish_website"},
+    }
+
+    # Config fields each module actually consumes. Used to build the input
+    # hash that decides whether a previous success can be reused: a change
+    # to any listed field re-runs the module, a change elsewhere does not.
+    MODULE_INPUT_FIELDS: Dict[str, tuple] = {
+        "subtitles": ("language", "whisper_model", "subtitle_settings"),
+        "subtitle_correction": ("ai_content_settings",),
+        "content_summary": ("ai_content_settings",),
+        "ai_content": ("ai_content_settings",),
+        "thumbnail_ai": (
+            "thumbnail_ai_backend", "thumbnail_ai_url", "thumbnail_ai_model",
+            "comfyui_server_url", "comfyui_width", "comfyui_height", "comfyui_steps"
+        ),
+        "thumbnail_compose": ("title", "speaker", "scripture", "thumbnail_settings"),
+        "publish_youtube": ("title", "speaker", "scripture", "series"),
+        "publish_website": ("title", "speaker", "scripture", "series"),
+        # archive consumes no config fields directly — its inputs are the
+        # publish outputs, folded in via MODULE_DEPS. Without this entry
+        # it would take the whole-config fallback, which returns before
+        # the upstream folding and never invalidates on a re-publish.
+        "archive": (),
+    }
+
+    # Module name -> handler method. Sibling table to MODULE_DEPS: adding
+    # a module means one entry here plus its dependencies there.
+    _HANDLERS: Dict[str, str] = {
+        "thumbnail_ai": "_run_thumbnail_ai",
+        "thumbnail_compose": "_run_thumbnail_compose",
+        "subtitles": "_run_subtitles",
+        "subtitle_correction": "_run_subtitle_correction",
+        "content_summary": "_run_content_summary",
+        "ai_content": "_run_ai_content",
+        "publish_youtube": "_run_publish_youtube",
+        "publish_website": "_run_publish_website",
+        "archive": "_run_archive",
+    }
+
+    # Standard asset lookups (subdirectory, suffix preference order),
+    # warmed at construction and shared by the thumbnail handlers
+    ASSET_LOOKUPS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+        ("backgrounds", (".jpg", ".png")),
+        ("logos", (".png", ".jpg")),
+        ("pastor", (".jpg", ".png")),
+    )
+
+    # Failures worth retrying before a module is marked failed: network
+    # blips and stalled servers on the modules that talk to Ollama,
+    # ComfyUI or the publish targets. Only genuinely transient types
+    # belong here — IOError is just an alias of OSError, so listing it
+    # would retry permission and disk-full errors that cannot succeed.
+    # Anything else fails the module on the first attempt.
+    TRANSIENT_EXCEPTIONS = (TimeoutError, ConnectionError, requests.ConnectionError, requests.Timeout)
+    # The module handlers absorb most exceptions into a failed result;
+    # these must escape the handlers so _run_module can retry them
+    # (transient) or reload a stale config (FileNotFoundError)
+    RETRYABLE_EXCEPTIONS = (FileNotFoundError,) + TRANSIENT_EXCEPTIONS
+    RETRY_TRIES = 3
+    RETRY_BACKOFF = 2.0  # seconds; delay grows as backoff ** attempt
+
     def __init__(self, config_path: str = "config/config.yaml"):
         self.config_path = config_path
         self.event_manager = EventManager()
         self.state_store = StateStore()
         self.logger = self._setup_logger()
+        # Process-lifetime engine/composer instances keyed by constructor
+        # args, so repeated module runs reuse loaded fonts and mmapped
+        # Whisper models instead of re-initializing per call
+        self._instance_cache = {}
+        self._instance_lock = threading.Lock()
+        # First-matching asset per (dir, suffixes), invalidated when the
+        # directory mtime changes — assets rarely change between events
+        self._asset_cache: Dict[Tuple[str, Tuple[str, ...]], Tuple[int, Optional[str]]] = {}
+        # Warm the asset cache off the critical path so the first event
+        # of a batch run finds backgrounds/logos/pastor already resolved
+        warmup_pool = ThreadPoolExecutor(max_workers=1)
+        self._asset_warmup = warmup_pool.submit(self._preload_assets)
+        warmup_pool.shutdown(wait=False)
         
     def _setup_logger(self) -> logging.Logger:
         """Setup logging configuration"""
         logger = logging.getLogger("WorkflowController")
         logger.setLevel(logging.INFO)
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        # getLogger returns a singleton, so guard the handler: without
+        # this, constructing N controllers emits every message N times
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(_FORMATTER)
+            logger.addHandler(handler)
         return logger
     
     def run_event(self, event_id: str, force: bool = False) -> Dict:
@@ -47,10 +157,18 @@ class WorkflowController:
         if not event_config:
             raise ValueError(f"Event not found: {event_id}")
         
-        # Check which modules are enabled
+        # Check which modules are enabled; a no-op run must not touch
+        # the state store at all
         enabled_modules = self._get_enabled_modules(event_config)
+        if not enabled_modules:
+            self.logger.info(f"No modules enabled for {event_id}, nothing to run")
+            return {}
         self.logger.info(f"Enabled modules: {enabled_modules}")
-        
+
+        # Validate the plan before execution begins — a malformed plan
+        # should fail up front, not after partial execution
+        deps = self._validate_plan(enabled_modules)
+
         # Initialize progress tracking
         total_modules = len(enabled_modules)
         self._update_progress(event_id, {
@@ -63,32 +181,46 @@ class WorkflowController:
             "details": "Starting workflow..."
         })
         
-        # Run modules in sequence
+        # Dispatch modules as their dependencies finish; independent
+        # modules run concurrently, so wall time is bounded by the
+        # critical path instead of the sum of module times
         results = {}
         completed_count = 0
-        
-        for idx, module_name in enumerate(enabled_modules):
-            try:
-                # Update progress before running
-                self._update_progress(event_id, {
-                    "status": "running",
-                    "current_module": module_name,
-                    "current_step": f"Running {module_name}",
-                    "completed_modules": list(results.keys()),
-                    "total_modules": total_modules,
-                    "progress_percent": int((completed_count / total_modules) * 100),
-                    "details": f"Processing module {idx + 1} of {total_modules}: {module_name}"
-                })
-                
-                result = self._run_module(event_id, module_name, event_config, force)
-                results[module_name] = result
-                self.state_store.save_module_result(event_id, module_name, result)
-                completed_count += 1
-                
-            except Exception as e:
-                self.logger.error(f"Module {module_name} failed: {str(e)}")
-                results[module_name] = {"status": "failed", "error": str(e)}
-                completed_count += 1
+        run_ts = self._get_timestamp()  # shared by every module of this run
+        pending = list(enabled_modules)  # keeps the canonical order for ties
+        running = {}  # Future -> module name
+
+        # Buffer per-module result writes and flush them together at the
+        # end of the run instead of one disk write per completion
+        with self.state_store.batch(event_id) as batch:
+            with ThreadPoolExecutor(max_workers=max(1, total_modules)) as pool:
+                while pending or running:
+                    ready = [name for name in pending if deps[name] <= results.keys()]
+                    for module_name in ready:
+                        pending.remove(module_name)
+                        self._update_progress(event_id, {
+                            "status": "running",
+                            "current_module": module_name,
+                            "current_step": f"Running {module_name}",
+                            "completed_modules": list(results.keys()),
+                            "total_modules": total_modules,
+                            "progress_percent": int((completed_count / total_modules) * 100),
+                            "details": f"Processing module {completed_count + 1} of {total_modules}: {module_name}"
+                        })
+                        future = pool.submit(self._run_module, event_id, module_name, event_config, force, run_ts)
+                        running[future] = module_name
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        module_name = running.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            self.logger.error(f"Module {module_name} failed: {str(e)}")
+                            result = {"status": "failed", "error": str(e)}
+                        results[module_name] = result
+                        batch.save_module_result(module_name, result)
+                        completed_count += 1
         
         # Final progress update
         self._update_progress(event_id, {
@@ -102,10 +234,51 @@ class WorkflowController:
         })
         
         # Save final workflow state
-        self.state_store.save_workflow_state(event_id, results)
+        self.state_store.save_workflow_state_sync(event_id, results)
         
         return results
     
+    def _validate_plan(self, enabled_modules: List[str]) -> Dict[str, Set[str]]:
+        """Build and validate the dependency subgraph for a run
+
+        Dependencies on disabled modules are dropped with a warning (the
+        dependent still runs and relies on its own fallbacks); cyclic
+        plans are rejected before any state is written.
+
+        Raises:
+            ValueError: if the plan contains a dependency cycle
+        """
+        enabled_set = set(enabled_modules)
+        deps = {}
+        for name in enabled_modules:
+            wanted = self.MODULE_DEPS.get(name, set())
+            missing = wanted - enabled_set
+            if missing:
+                self.logger.warning(
+                    f"Module {name} depends on disabled modules {sorted(missing)}, "
+                    f"running without them"
+                )
+            deps[name] = wanted & enabled_set
+        self._check_acyclic(deps)
+        return deps
+
+    @staticmethod
+    def _check_acyclic(deps: Dict[str, Set[str]]) -> None:
+        """Validate the module plan with Kahn's algorithm
+
+        Raises:
+            ValueError: if the dependency subgraph contains a cycle
+        """
+        remaining = {name: set(dep_set) for name, dep_set in deps.items()}
+        while remaining:
+            ready = [name for name, dep_set in remaining.items() if not dep_set]
+            if not ready:
+                raise ValueError(f"Cyclic module dependencies: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for dep_set in remaining.values():
+                dep_set.difference_update(ready)
+
     def _get_enabled_modules(self, event_config: Dict) -> List[str]:
         """Extract enabled modules from event configuration in correct execution order"""
         modules_config = event_config.get("modules", {})
@@ -139,66 +312,211 @@ class WorkflowController:
         
         return enabled_modules
     
-    def _run_module(self, event_id: str, module_name: str, event_config: Dict, force: bool) -> Dict:
+    def _run_module(self, event_id: str, module_name: str, event_config: Dict, force: bool,
+                    run_ts: Optional[str] = None) -> Dict:
         """
         Execute a single module
-        
+
         Args:
             event_id: Event identifier
             module_name: Name of the module to run
             event_config: Full event configuration
             force: Force re-run if already completed
-            
+            run_ts: Timestamp shared by all modules of one run (optional)
+
         Returns:
             Module execution result
         """
-        # Check if already completed (unless force=True)
+        if run_ts is None:
+            run_ts = self._get_timestamp()
+        # Check if already completed with the same inputs (unless force=True).
+        # Results carry the hash of the config fields the module consumed,
+        # so editing e.g. the title re-runs thumbnail_compose automatically
+        # while an unchanged event still skips the expensive work.
+        input_hash = self._input_hash(module_name, event_config, event_id)
         if not force:
-            existing_result = self.state_store.get_module_result(event_id, module_name)
+            existing_result = self.state_store.get_module_result_sync(event_id, module_name)
             if existing_result and existing_result.get("status") == "success":
-                self.logger.info(f"Module {module_name} already completed, skipping")
-                return existing_result
-        
+                stored_hash = existing_result.get("input_hash")
+                if stored_hash is None or stored_hash == input_hash:
+                    self.logger.info(f"Module {module_name} already completed, skipping")
+                    return existing_result
+                self.logger.info(f"Module {module_name} inputs changed, re-running")
+
         self.logger.info(f"Running module: {module_name}")
-        
-        # Module routing logic
-        try:
-            if module_name == "thumbnail_ai":
-                return self._run_thumbnail_ai(event_id, event_config)
-            elif module_name == "thumbnail_compose":
-                return self._run_thumbnail_compose(event_id, event_config)
-            elif module_name == "subtitles":
-                return self._run_subtitles(event_id, event_config)
-            elif module_name == "subtitle_correction":
-                return self._run_subtitle_correction(event_id, event_config)
-            elif module_name == "content_summary":
-                return self._run_content_summary(event_id, event_config)
-            elif module_name == "ai_content":
-                return self._run_ai_content(event_id, event_config)
-            elif module_name == "publish_youtube":
-                return self._run_publish_youtube(event_id, event_config)
-            elif module_name == "publish_website":
-                return self._run_publish_website(event_id, event_config)
-            elif module_name == "archive":
-                return self._run_archive(event_id, event_config)
-            else:
+
+        last_error = None
+        for attempt in range(self.RETRY_TRIES):
+            if attempt:
+                delay = self.RETRY_BACKOFF ** attempt
+                self.logger.warning(
+                    f"Module {module_name} attempt {attempt} failed ({last_error}), "
+                    f"retrying in {delay:.0f}s"
+                )
+                time.sleep(delay)
+            try:
+                result = self._dispatch_module(module_name, event_id, event_config)
+                result["input_hash"] = input_hash
+                # All results of one run share the run timestamp, so a
+                # completed run is identifiable as a unit in the state
+                result.setdefault("run_ts", run_ts)
+                if attempt:
+                    # Record how many tries it took so reruns can be audited
+                    result.setdefault("attempts", attempt + 1)
+                return result
+            except FileNotFoundError as e:
+                # A stale config may point at a moved model or asset;
+                # refresh it from disk and drop cached instances so the
+                # retry starts from a fresh engine/composer
+                last_error = e
+                event_config = self.event_manager.load_event(event_id) or event_config
+                with self._instance_lock:
+                    self._instance_cache.clear()
+            except self.TRANSIENT_EXCEPTIONS as e:
+                last_error = e
+            except Exception as e:
+                self.logger.error(f"Module {module_name} failed: {str(e)}")
                 return {
-                    "status": "skipped",
-                    "message": f"Unknown module: {module_name}",
+                    "status": "failed",
+                    "error": str(e),
                     "timestamp": self._get_timestamp()
                 }
-        except Exception as e:
-            self.logger.error(f"Module {module_name} failed: {str(e)}")
+
+        self.logger.error(
+            f"Module {module_name} failed after {self.RETRY_TRIES} attempts: {last_error}"
+        )
+        return {
+            "status": "failed",
+            "error": str(last_error),
+            "attempts": self.RETRY_TRIES,
+            "run_ts": run_ts,
+            "timestamp": self._get_timestamp()
+        }
+
+    def _input_hash(self, module_name: str, event_config: Dict,
+                    event_id: Optional[str] = None) -> str:
+        """Stable digest of the inputs a module consumes"""
+        inputs = self._module_inputs(module_name, event_config, event_id)
+        payload = json.dumps(inputs, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _module_inputs(self, module_name: str, event_config: Dict,
+                       event_id: Optional[str] = None) -> Dict:
+        """Collect the subset of config a module reads for hashing
+
+        Unknown modules fall back to the whole config (minus runtime-only
+        keys) so any edit re-runs them. Modules with dependencies also
+        fold each upstream result's identity into their inputs — a
+        re-run of subtitles must invalidate correction/summary/publish,
+        otherwise they keep serving outputs derived from the old
+        transcript while reporting "already completed".
+        """
+        fields = self.MODULE_INPUT_FIELDS.get(module_name)
+        if fields is None:
+            return {k: v for k, v in event_config.items() if not k.startswith('_')}
+
+        inputs = {name: event_config.get(name) for name in fields}
+        if module_name == "subtitles":
+            # File inputs are identified by (path, mtime, size) rather
+            # than contents so hashing stays cheap for large videos
+            video_files = event_config.get("inputs", {}).get("video_files", [])
+            inputs["video_files"] = [self._file_signature(p) for p in video_files]
+
+        deps = self.MODULE_DEPS.get(module_name)
+        if deps and event_id is not None:
+            # The scheduler dispatches a module only after its deps
+            # finish, and the run's batch writes each result through to
+            # disk as it lands, so this read sees the upstream result —
+            # fresh or reused — and its input_hash/run_ts pair that
+            # identifies the output this module is about to consume
+            upstream = {}
+            for dep in sorted(deps):
+                dep_result = self.state_store.get_module_result_sync(event_id, dep)
+                if dep_result:
+                    upstream[dep] = [dep_result.get("input_hash"), dep_result.get("run_ts")]
+                else:
+                    upstream[dep] = None
+            inputs["_upstream"] = upstream
+        return inputs
+
+    @staticmethod
+    def _file_signature(path: str) -> List:
+        try:
+            st = os.stat(path)
+            return [path, st.st_mtime_ns, st.st_size]
+        except OSError:
+            return [path, None, None]
+
+    def _preload_assets(self) -> None:
+        """Populate the asset cache for the standard lookups"""
+        assets_dir = Path("assets")
+        for sub, patterns in self.ASSET_LOOKUPS:
+            try:
+                self._find_first_asset(assets_dir / sub, patterns)
+            except OSError:
+                pass  # directory vanished mid-scan; lookup repeats later
+
+    def _find_first_asset(self, dir_path: Path, patterns: Tuple[str, ...]) -> Optional[str]:
+        """First file in dir_path matching the suffixes, cached by dir mtime
+
+        Suffixes are tried in preference order (e.g. ('.jpg', '.png')
+        prefers a jpg). One scandir replaces the per-call glob walks;
+        repeat lookups hit the cache until the directory changes.
+        """
+        try:
+            mtime_ns = dir_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+        key = (str(dir_path), patterns)
+        cached = self._asset_cache.get(key)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+
+        with os.scandir(dir_path) as it:
+            names = sorted(entry.name for entry in it if entry.is_file())
+
+        found = None
+        for suffix in patterns:
+            for name in names:
+                if name.lower().endswith(suffix):
+                    found = str(dir_path / name)
+                    break
+            if found:
+                break
+
+        self._asset_cache[key] = (mtime_ns, found)
+        return found
+
+    def _get_or_create(self, kind: str, factory, **kwargs):
+        """Return a cached instance for (kind, kwargs), constructing it once
+
+        Engine/composer construction is the expensive part of repeat runs
+        (font loading, model-file probing); a dict lookup replaces it on
+        every call after the first.
+        """
+        key = (kind, tuple(sorted(kwargs.items())))
+        with self._instance_lock:
+            instance = self._instance_cache.get(key)
+            if instance is None:
+                instance = factory(**kwargs)
+                self._instance_cache[key] = instance
+            return instance
+
+    def _dispatch_module(self, module_name: str, event_id: str, event_config: Dict) -> Dict:
+        """Route a module name to its implementation via the _HANDLERS table"""
+        handler_name = self._HANDLERS.get(module_name)
+        if handler_name is None:
             return {
-                "status": "failed",
-                "error": str(e),
+                "status": "skipped",
+                "message": f"Unknown module: {module_name}",
                 "timestamp": self._get_timestamp()
             }
+        return getattr(self, handler_name)(event_id, event_config)
     
     def _get_timestamp(self) -> str:
-        """Get current timestamp in ISO format"""
-        from datetime import datetime
-        return datetime.now().isoformat()
+        """Get current timestamp in ISO format (UTC, DST-safe)"""
+        return datetime.now(timezone.utc).isoformat()
     
     def _update_progress(self, event_id: str, progress_data: Dict) -> None:
         """Update workflow progress"""
@@ -234,7 +552,7 @@ class WorkflowController:
         
         try:
             result = self._run_module(event_id, module_name, event_config, force)
-            self.state_store.save_module_result(event_id, module_name, result)
+            self.state_store.save_module_result_sync(event_id, module_name, result)
             return result
         except Exception as e:
             error_result = {
@@ -242,7 +560,7 @@ class WorkflowController:
                 "error": str(e),
                 "timestamp": self._get_timestamp()
             }
-            self.state_store.save_module_result(event_id, module_name, error_result)
+            self.state_store.save_module_result_sync(event_id, module_name, error_result)
             return error_result
     
     def get_module_inputs(self, event_id: str, module_name: str) -> Dict:
@@ -400,14 +718,10 @@ class WorkflowController:
             # Output path
             bg_image_path = output_dir / "ai_background.png"
             
-            # Find fallback asset (optional)
-            fallback = None
-            assets_dir = Path("assets")
-            bg_dir = assets_dir / "backgrounds"
-            if bg_dir.exists():
-                bg_files = list(bg_dir.glob("*.jpg")) + list(bg_dir.glob("*.png"))
-                if bg_files:
-                    fallback = str(bg_files[0])
+            # Find fallback asset (optional); the warmup started at
+            # construction is usually done long before the first module
+            self._asset_warmup.result()
+            fallback = self._find_first_asset(Path("assets") / "backgrounds", (".jpg", ".png"))
             
             # Handle ComfyUI backend separately
             if backend == "comfyui":
@@ -488,6 +802,8 @@ class WorkflowController:
                     "timestamp": self._get_timestamp()
                 }
         
+        except self.RETRYABLE_EXCEPTIONS:
+            raise
         except Exception as e:
             self.logger.error(f"Thumbnail AI module error: {str(e)}")
             return {
@@ -549,15 +865,20 @@ class WorkflowController:
             
             # Output path
             thumbnail_path = output_dir / "thumbnail.jpg"
+
+            # Asset lookups below hit the cache warmed at construction
+            self._asset_warmup.result()
             
-            # Initialize composer
-            composer = ThumbnailComposer()
+            # Reuse the composer across events (font loading is per-instance)
+            composer = self._get_or_create("thumbnail_composer", ThumbnailComposer)
             
             # Look for AI-generated background first
             background = None
             ai_bg = output_dir / "ai_background.png"
             if ai_bg.exists():
-                background = str(ai_bg)
+                # Pass the Path through: compose trusts Path objects as
+                # already stat-checked and skips its own exists probe
+                background = ai_bg
                 self.logger.info("Using AI-generated background")
             else:
                 # Check if user specified background
@@ -565,41 +886,21 @@ class WorkflowController:
                     background = thumb_settings.get("background_path")
                 else:
                     # Fallback to assets directory
-                    assets_dir = Path("assets")
-                    bg_dir = assets_dir / "backgrounds"
-                    if bg_dir.exists():
-                        bg_files = list(bg_dir.glob("*.jpg")) + list(bg_dir.glob("*.png"))
-                        if bg_files:
-                            background = str(bg_files[0])
-                            self.logger.info(f"Using fallback background: {background}")
+                    background = self._find_first_asset(Path("assets") / "backgrounds", (".jpg", ".png"))
+                    if background:
+                        self.logger.info(f"Using fallback background: {background}")
             
             # Get logo (user-specified or default)
             logo = None
             if show_logo:
-                if thumb_settings.get("logo_path"):
-                    logo = thumb_settings.get("logo_path")
-                else:
-                    # Use first logo from assets
-                    assets_dir = Path("assets")
-                    logo_dir = assets_dir / "logos"
-                    if logo_dir.exists():
-                        logo_files = list(logo_dir.glob("*.png")) + list(logo_dir.glob("*.jpg"))
-                        if logo_files:
-                            logo = str(logo_files[0])
-            
+                logo = thumb_settings.get("logo_path") or \
+                    self._find_first_asset(Path("assets") / "logos", (".png", ".jpg"))
+
             # Get pastor portrait (user-specified or default)
             pastor = None
             if show_pastor:
-                if thumb_settings.get("pastor_path"):
-                    pastor = thumb_settings.get("pastor_path")
-                else:
-                    # Use first pastor from assets
-                    assets_dir = Path("assets")
-                    pastor_dir = assets_dir / "pastor"
-                    if pastor_dir.exists():
-                        pastor_files = list(pastor_dir.glob("*.jpg")) + list(pastor_dir.glob("*.png"))
-                        if pastor_files:
-                            pastor = str(pastor_files[0])
+                pastor = thumb_settings.get("pastor_path") or \
+                    self._find_first_asset(Path("assets") / "pastor", (".jpg", ".png"))
             
             # Compose thumbnail with new flexible parameters
             success, error = composer.compose(
@@ -642,6 +943,8 @@ class WorkflowController:
                     "timestamp": self._get_timestamp()
                 }
         
+        except self.RETRYABLE_EXCEPTIONS:
+            raise
         except Exception as e:
             self.logger.error(f"Thumbnail module error: {str(e)}")
             return {
@@ -689,8 +992,9 @@ class WorkflowController:
             self.logger.info(f"Using Whisper model: {model}, Language: {language}")
             self.logger.info(f"Subtitle settings: max_length={max_length}, split_on_word={split_on_word}")
             
-            # Initialize engine with selected model
-            engine = WhisperCppEngine(model=model)
+            # Reuse the engine for this model across events (model probing
+            # and load happen at init)
+            engine = self._get_or_create("whisper_engine", WhisperCppEngine, model=model)
             
             # Check if model exists
             if not engine.check_model():
@@ -728,6 +1032,8 @@ class WorkflowController:
                     "timestamp": self._get_timestamp()
                 }
         
+        except self.RETRYABLE_EXCEPTIONS:
+            raise
         except Exception as e:
             self.logger.error(f"Subtitle module error: {str(e)}")
             return {
@@ -811,6 +1117,8 @@ class WorkflowController:
                     "timestamp": self._get_timestamp()
                 }
         
+        except self.RETRYABLE_EXCEPTIONS:
+            raise
         except Exception as e:
             self.logger.error(f"Subtitle correction error: {str(e)}")
             return {
@@ -912,6 +1220,8 @@ class WorkflowController:
                     "timestamp": self._get_timestamp()
                 }
         
+        except self.RETRYABLE_EXCEPTIONS:
+            raise
         except Exception as e:
             self.logger.error(f"Content summary generation error: {str(e)}")
             return {
@@ -998,6 +1308,8 @@ class WorkflowController:
                     "timestamp": self._get_timestamp()
                 }
         
+        except self.RETRYABLE_EXCEPTIONS:
+            raise
         except Exception as e:
             self.logger.error(f"AI content module error: {str(e)}")
             return {
@@ -1055,7 +1367,7 @@ def main():
             print("Error: --event required for 'run' command")
             return
         results = controller.run_event(args.event, force=args.force)
-        print(json.dumps(results, indent=2))
+        print(_dumps(results))
     elif args.command == 'status':
         print("Status command not yet implemented")
     elif args.command == 'list':
@@ -2,81 +2,596 @@
 AI Content Processor using Ollama
 Corrects subtitles and generates summaries for downstream tasks
 """
+import asyncio
+import hashlib
+import io
+import itertools
 import logging
 import json
+import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple
-import requests
+
+# httpx (and its dependency tree) is imported lazily on first HTTP use
+# so importing this module — or constructing a processor that never
+# reaches the network — stays cheap
+
+# C-accelerated JSON for the streamed NDJSON chunks and /api/tags
+# payloads; falls back to stdlib json when orjson is absent
+try:
+    import orjson
+    _loads = orjson.loads
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Matches one SRT block: index line, timestamp line, then text up to the
+# next block (or end of input). Compiled once; finditer keeps the
+# per-block loop inside the regex engine instead of Python.
+_SRT_BLOCK_RE = re.compile(
+    r'(\d+)\n([^\n]*-->[^\n]*)\n(.*?)(?=\n\n+\d+\n|\Z)',
+    re.DOTALL
+)
+
+# Sentence boundaries (Latin and CJK terminators) for transcript
+# chunking; compiled once so repeated summary runs skip re-compilation
+_SENTENCE_RE = re.compile(r'(?<=[.!?。！？])\s+')
+
+# Non-speech markers like [Music] or [Applause] — nothing to correct
+_BRACKET_RE = re.compile(r'^\[[^\]]*\]$')
+
+# Corrected-SRT stem suffix, with or without the content-hash tag
+_CORRECTED_SUFFIX_RE = re.compile(r'_corrected(?:_[0-9a-f]{8})?$')
+
+# Repeated-word stutters ("the the", "we we") — the one ASR artifact
+# that shows up even in otherwise clean ASCII transcripts
+_STUTTER_RE = re.compile(r'\b(\w+)\s+\1\b', re.IGNORECASE)
+
+
+class LLMCache:
+    """Disk-backed exact-match cache for LLM responses
+
+    Keyed by sha256 over (model, system prompt, prompt). A regenerated
+    summary over the same transcript, or a correction batch repeated by
+    a forced re-run, is served from disk without hitting Ollama.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, model: str, system_prompt: str, prompt: str) -> Path:
+        payload = json.dumps(
+            {"m": model, "s": system_prompt, "p": prompt}, sort_keys=True
+        )
+        return self.cache_dir / f"{hashlib.sha256(payload.encode()).hexdigest()}.txt"
+
+    def get(self, model: str, system_prompt: str, prompt: str) -> Optional[str]:
+        try:
+            return self._path(model, system_prompt, prompt).read_text(encoding='utf-8')
+        except OSError:
+            return None
+
+    def put(self, model: str, system_prompt: str, prompt: str, response: str) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(model, system_prompt, prompt)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(response, encoding='utf-8')
+        os.replace(tmp_path, path)
 
 
 class AIContentProcessor:
     """Uses Ollama to correct subtitles and generate content summaries"""
-    
+
+    # How long a fetched /api/tags listing stays valid; the pipeline
+    # checks availability before every step and nothing changes between
+    TAGS_TTL = 30.0
+
+    # Bounds for the adaptive correction batch size
+    MIN_BATCH_SIZE = 4
+    MAX_BATCH_SIZE = 64
+
+    # How long a host that failed at the transport level sits out of
+    # the round-robin rotation
+    HOST_QUARANTINE = 60.0
+
+    # Deterministic decoding: identical prompts produce identical
+    # responses, so re-runs hit the exact-match disk cache and batch
+    # validation failures are reproducible instead of flaky
+    DEFAULT_OPTIONS = {
+        "temperature": 0,
+        "top_p": 1,
+        "seed": 42
+    }
+
+    # Class-level so the correction output hash can include it — a
+    # prompt change invalidates previously corrected files
+    CORRECTION_SYSTEM_PROMPT = """You are a subtitle text correction assistant. Fix ONLY the subtitle text content while preserving the exact SRT format.
+
+CRITICAL RULES:
+1) Keep the EXACT number of subtitle blocks
+2) Keep ALL timestamps unchanged
+3) Keep ALL index numbers unchanged
+4) Keep ALL blank lines between blocks
+5) ONLY fix: typos, ASR errors, grammar, unnatural wording
+6) Output VALID SRT format
+
+Example input:
+1
+00:00:00,000 --> 00:00:02,300
+李政階妹平安
+
+2
+00:00:02,300 --> 00:00:05,900
+感謝祝我們來到他的面前
+
+Example output (same structure, corrected text):
+1
+00:00:00,000 --> 00:00:02,300
+李政道妹平安
+
+2
+00:00:02,300 --> 00:00:05,900
+感謝主我們來到他的面前"""
+
     def __init__(
         self,
         model: str = "qwen2.5:latest",
         host: str = "http://localhost:11434",
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        cache_dir: Optional[str] = "events/.llm_cache",
+        num_ctx: Optional[int] = None,
+        num_predict: Optional[int] = None,
+        num_batch: Optional[int] = None,
+        correction_model: Optional[str] = None,
+        summary_model: Optional[str] = None
     ):
         self.model = model
-        self.host = host
+        # Optional per-stage tiers: correction is a light editing task
+        # that a small int4-quantized model handles at several times the
+        # tok/s, while summaries can stay on the larger model. Either
+        # falls back to self.model when unset or not pulled.
+        self.correction_model = correction_model
+        self.summary_model = summary_model
         self.logger = logger or logging.getLogger(__name__)
-        self.api_url = f"{host}/api/generate"
+        # host may be a single URL, a comma-separated list, or a list —
+        # a multi-GPU rig runs one Ollama per GPU and generation calls
+        # round-robin across them (tags/unload stay on the first host)
+        if isinstance(host, str):
+            hosts = [h.strip().rstrip('/') for h in host.split(',') if h.strip()]
+        else:
+            hosts = [h.rstrip('/') for h in host]
+        self._hosts = hosts or ["http://localhost:11434"]
+        self.host = self._hosts[0]
+        self.api_url = f"{self.host}/api/generate"
+        self._host_cycle = itertools.cycle(self._hosts)
+        self._host_lock = threading.Lock()
+        self._host_down: Dict[str, float] = {}
+        # Fixing num_ctx keeps the server from re-allocating KV buffers
+        # per request; num_predict/num_batch let operators match their
+        # server's parallel-slot memory split
+        self.options = dict(self.DEFAULT_OPTIONS)
+        for key, value in (
+            ("num_ctx", num_ctx),
+            ("num_predict", num_predict),
+            ("num_batch", num_batch)
+        ):
+            if value is not None:
+                self.options[key] = value
+        # Connection pool is built on first use (see _session below)
+        self._session_obj = None
+        self._tags_cache: Optional[Tuple[float, Dict]] = None
+        # Pass cache_dir=None to disable response caching
+        self._cache = LLMCache(cache_dir) if cache_dir else None
+        # Learned correction batch size and latency-per-segment EMA
+        self._last_good_batch: Optional[int] = None
+        self._latency_ema: Optional[float] = None
+        # (path, blocks) from the last correction, so process_content
+        # can hand the parsed list straight to generate_summary
+        self._last_corrected: Optional[Tuple[str, List[Dict]]] = None
+
+    @property
+    def _session(self):
+        """One keep-alive connection pool shared by every Ollama call
+
+        Constructed lazily: without it each request paid a fresh TCP
+        handshake, and building it in __init__ made even local-only
+        processor use pay the httpx import and pool setup.
+        """
+        if self._session_obj is None:
+            import httpx
+            self._session_obj = httpx.Client(
+                timeout=httpx.Timeout(300.0, connect=10.0),
+                limits=httpx.Limits(
+                    max_keepalive_connections=40,
+                    max_connections=100,
+                    keepalive_expiry=30.0
+                ),
+                headers={"Accept-Encoding": "gzip, deflate"}
+            )
+        return self._session_obj
+
+    @_session.setter
+    def _session(self, client) -> None:
+        self._session_obj = client
+
+    def close(self) -> None:
+        """Release the HTTP connection pool, if one was created"""
+        if self._session_obj is not None:
+            self._session_obj.close()
+            self._session_obj = None
+
+    def __enter__(self) -> "AIContentProcessor":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
         
-    def _check_ollama_available(self) -> bool:
-        """Check if Ollama service is available"""
+    def _get_tags(self) -> Optional[Dict]:
+        """Fetch /api/tags, cached for TAGS_TTL seconds
+
+        correct_subtitles and generate_summary each check both service
+        and model availability, which used to mean four identical GETs
+        per process_content run; the cache collapses them to one.
+        """
+        now = time.monotonic()
+        if self._tags_cache and now - self._tags_cache[0] < self.TAGS_TTL:
+            return self._tags_cache[1]
+
         try:
-            response = requests.get(f"{self.host}/api/tags", timeout=5)
-            return response.status_code == 200
+            response = self._session.get(f"{self.host}/api/tags", timeout=5)
         except Exception as e:
             self.logger.error(f"Ollama not available: {e}")
-            return False
-    
+            return None
+
+        if response.status_code != 200:
+            return None
+
+        tags = _loads(response.content)
+        self._tags_cache = (now, tags)
+        return tags
+
+    def _check_ollama_available(self) -> bool:
+        """Check if Ollama service is available"""
+        return self._get_tags() is not None
+
     def _check_model_available(self) -> bool:
         """Check if the specified model is available"""
-        try:
-            response = requests.get(f"{self.host}/api/tags", timeout=5)
-            if response.status_code == 200:
-                models = response.json().get("models", [])
-                return any(m.get("name") == self.model for m in models)
-            return False
-        except Exception as e:
-            self.logger.error(f"Failed to check model: {e}")
+        tags = self._get_tags()
+        if not tags:
             return False
+        return any(m.get("name") == self.model for m in tags.get("models", []))
+
+    def _ensure_available(self) -> Optional[str]:
+        """Answer both availability checks from one cached tags fetch
+
+        Returns an error message, or None when the service and model
+        are both up. Keeps correct_subtitles and generate_summary from
+        issuing paired checks at every stage entry.
+        """
+        tags = self._get_tags()
+        if tags is None:
+            return "Ollama service not available"
+        if not any(m.get("name") == self.model for m in tags.get("models", [])):
+            return f"Model {self.model} not available"
+        return None
+
+    def _stage_model(self, preferred: Optional[str]) -> Optional[str]:
+        """Resolve a per-stage model tier, falling back to self.model
+
+        Returns None (meaning "use self.model") when the preferred
+        model is unset or not pulled on the server, so a mistyped or
+        missing tier degrades to the default instead of failing the
+        pipeline.
+        """
+        if not preferred or preferred == self.model:
+            return None
+        tags = self._get_tags() or {}
+        if any(m.get("name") == preferred for m in tags.get("models", [])):
+            return preferred
+        self.logger.warning(
+            f"Model {preferred} not available, using {self.model} instead"
+        )
+        return None
     
-    def _call_ollama(self, prompt: str, system_prompt: str = "", keep_alive: str = "5m") -> Optional[str]:
+    def _call_ollama(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        keep_alive: str = "5m",
+        options: Optional[Dict] = None,
+        model: Optional[str] = None
+    ) -> Optional[str]:
         """Call Ollama API and get response
-        
+
         Args:
             prompt: The prompt to send to the model
             system_prompt: System prompt for the model
             keep_alive: Duration to keep model in memory after request (default: "5m")
                         Set to "0" to unload immediately after request
                         Examples: "5m" (5 minutes), "1h" (1 hour), "0" (unload immediately)
+            options: Ollama decoding options; defaults to self.options
+            model: Model override for this call; defaults to self.model
         """
+        model = model or self.model
+        if self._cache:
+            cached = self._cache.get(model, system_prompt, prompt)
+            if cached is not None:
+                return cached
+
+        host = self._next_host()
         try:
             payload = {
-                "model": self.model,
+                "model": model,
                 "prompt": prompt,
-                "stream": False,
-                "keep_alive": keep_alive
+                "stream": True,
+                "keep_alive": keep_alive,
+                "options": options if options is not None else self.options
             }
             if system_prompt:
                 payload["system"] = system_prompt
-            
-            response = requests.post(self.api_url, json=payload, timeout=300)
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("response", "").strip()
-            else:
-                self.logger.error(f"Ollama API error: {response.status_code}")
-                return None
+
+            # Stream NDJSON chunks so tokens arrive as the model decodes
+            # them instead of waiting on the server to buffer the full
+            # generation; a stalled stream also times out early rather
+            # than after the whole request budget
+            parts = []
+            with self._session.stream(
+                "POST", f"{host}/api/generate",
+                content=_dumps(payload), headers=_JSON_HEADERS, timeout=300
+            ) as response:
+                if response.status_code != 200:
+                    self.logger.error(f"Ollama API error: {response.status_code}")
+                    return None
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = _loads(line)
+                    parts.append(chunk.get("response", ""))
+                    if chunk.get("done"):
+                        break
+
+            text = ''.join(parts).strip()
+            if text and self._cache:
+                self._cache.put(model, system_prompt, prompt, text)
+            return text
         except Exception as e:
+            self._mark_host_down(host)
             self.logger.error(f"Failed to call Ollama: {e}")
             return None
     
+    async def _acall_ollama(
+        self,
+        client: "httpx.AsyncClient",
+        prompt: str,
+        system_prompt: str = "",
+        keep_alive: str = "5m",
+        options: Optional[Dict] = None,
+        model: Optional[str] = None
+    ) -> Optional[str]:
+        """Async variant of _call_ollama sharing one client connection pool"""
+        model = model or self.model
+        if self._cache:
+            cached = self._cache.get(model, system_prompt, prompt)
+            if cached is not None:
+                return cached
+
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "keep_alive": keep_alive,
+            "options": options if options is not None else self.options
+        }
+        if system_prompt:
+            payload["system"] = system_prompt
+
+        host = self._next_host()
+        try:
+            parts = []
+            async with client.stream(
+                "POST", f"{host}/api/generate",
+                content=_dumps(payload), headers=_JSON_HEADERS, timeout=300
+            ) as response:
+                if response.status_code != 200:
+                    self.logger.error(f"Ollama API error: {response.status_code}")
+                    return None
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = _loads(line)
+                    parts.append(chunk.get("response", ""))
+                    if chunk.get("done"):
+                        break
+
+            text = ''.join(parts).strip()
+            if text and self._cache:
+                self._cache.put(model, system_prompt, prompt, text)
+            return text
+        except Exception as e:
+            self._mark_host_down(host)
+            self.logger.error(f"Failed to call Ollama: {e}")
+            return None
+
+    def _next_host(self) -> str:
+        """Round-robin across configured hosts, skipping quarantined ones
+
+        If every host is quarantined the next one is returned anyway —
+        better to retry a possibly-recovered endpoint than to fail
+        without sending the request at all.
+        """
+        with self._host_lock:
+            for _ in range(len(self._hosts)):
+                candidate = next(self._host_cycle)
+                if self._host_down.get(candidate, 0.0) <= time.monotonic():
+                    return candidate
+            return next(self._host_cycle)
+
+    def _mark_host_down(self, host: str) -> None:
+        """Quarantine a host after a transport-level failure"""
+        if len(self._hosts) > 1:
+            self._host_down[host] = time.monotonic() + self.HOST_QUARANTINE
+            self.logger.warning(
+                f"Quarantining Ollama host {host} for {self.HOST_QUARANTINE:.0f}s"
+            )
+
+    @staticmethod
+    def _system_for(system_prompt, i: int) -> str:
+        """Resolve a shared or per-prompt system prompt for index i"""
+        if isinstance(system_prompt, list):
+            return system_prompt[i]
+        return system_prompt
+
+    async def _gather_prompts_async(
+        self, prompts: List[str], system_prompt, model: Optional[str] = None
+    ) -> List[Optional[str]]:
+        """Send a set of prompts concurrently, preserving order
+
+        Concurrency is bounded by OLLAMA_NUM_PARALLEL (default 4) to
+        match the server's parallel slots; with OLLAMA_MAX_LOADED_MODELS
+        sized accordingly, network wait overlaps model compute instead
+        of serializing on full generation latency per batch.
+        system_prompt may be one string shared by every prompt, or a
+        list aligned with prompts.
+        """
+        sem = asyncio.Semaphore(int(os.getenv("OLLAMA_NUM_PARALLEL", "4")))
+
+        import httpx
+
+        async with httpx.AsyncClient() as client:
+            async def worker(i: int, prompt: str) -> Optional[str]:
+                async with sem:
+                    return await self._acall_ollama(
+                        client, prompt, self._system_for(system_prompt, i),
+                        model=model
+                    )
+
+            return list(await asyncio.gather(
+                *(worker(i, p) for i, p in enumerate(prompts))
+            ))
+
+    def _fanout_prompts(
+        self, prompts: List[str], system_prompt, model: Optional[str] = None
+    ) -> List[Optional[str]]:
+        """Run the prompt fan-out from sync code, degrading to threads
+
+        asyncio.run cannot nest inside a running loop, so callers that
+        reach us from an async context (the FastAPI server dispatching
+        module handlers in-loop) would crash the async path. Detect a
+        live loop and fall back to a thread pool over the sync client —
+        the GIL is released during socket I/O, so batches still overlap.
+        Order is preserved either way.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(
+                self._gather_prompts_async(prompts, system_prompt, model=model)
+            )
+
+        workers = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+        results: List[Optional[str]] = [None] * len(prompts)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(
+                    self._call_ollama, prompt, self._system_for(system_prompt, i),
+                    model=model
+                ): i
+                for i, prompt in enumerate(prompts)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        return results
+
+    @staticmethod
+    def _approx_tokens(text: str) -> int:
+        """Rough token count — ~3 bytes/token holds for mixed CJK/Latin"""
+        return max(1, len(text) // 3)
+
+    def _pack_batches(
+        self,
+        subtitles: List[Dict],
+        max_blocks: int,
+        target_tokens: int = 3000
+    ) -> List[List[Dict]]:
+        """Greedily pack blocks into batches by token budget
+
+        A fixed block count makes batch cost swing with segment length:
+        forty wordy cues can overflow the context window while forty
+        terse CJK cues waste most of a request on prompt overhead.
+        Packing until either the token budget or the (adaptively
+        learned) block cap is hit keeps every request a similar size.
+        """
+        batches: List[List[Dict]] = []
+        current: List[Dict] = []
+        current_tokens = 0
+        for sub in subtitles:
+            cost = self._approx_tokens(sub['text']) + 8  # index + timestamp lines
+            if current and (
+                current_tokens + cost > target_tokens or len(current) >= max_blocks
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(sub)
+            current_tokens += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    @staticmethod
+    def _needs_correction(batch: List[Dict]) -> bool:
+        """Cheap pre-filter deciding whether a batch goes to the model
+
+        Whisper's worst confusions are in CJK (homophone swaps), so any
+        non-ASCII batch always gets corrected. Pure-ASCII batches skip
+        the round trip unless they show repeated-word stutters —
+        deliberately conservative, since a false "clean" just means one
+        English batch keeps its raw ASR text.
+        """
+        text = ' '.join(sub['text'] for sub in batch)
+        return not text.isascii() or bool(_STUTTER_RE.search(text))
+
+    def _batch_prompt(self, batch: List[Dict]) -> str:
+        """Build the strict correction prompt for one batch of blocks"""
+        srt_text = ''.join(
+            f"{sub['index']}\n{sub['timestamp']}\n{sub['text']}\n\n"
+            for sub in batch
+        )
+        return f"""Correct the subtitle text. Output MUST have exactly {len(batch)} blocks with same timestamps and numbers.
+
+Input SRT ({len(batch)} blocks):
+<<<
+{srt_text.strip()}
+>>>
+
+Output corrected SRT (MUST be {len(batch)} blocks, same format):"""
+
+    def _content_hash(self, path: str, *parts: str) -> str:
+        """First 8 hex chars of sha256 over the given parts + file bytes
+
+        Used to content-address generated outputs so an unchanged input
+        re-run can reuse the file on disk instead of re-querying the
+        model.
+        """
+        h = hashlib.sha256()
+        for part in parts:
+            h.update(part.encode('utf-8'))
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        return h.hexdigest()[:8]
+
     def unload_model(self) -> bool:
         """Explicitly unload the model from memory
         
@@ -90,7 +605,9 @@ class AIContentProcessor:
                 "prompt": "",
                 "keep_alive": "0"
             }
-            response = requests.post(self.api_url, json=payload, timeout=10)
+            response = self._session.post(
+                self.api_url, content=_dumps(payload), headers=_JSON_HEADERS, timeout=10
+            )
             return response.status_code == 200
         except Exception as e:
             self.logger.error(f"Failed to unload model: {e}")
@@ -98,47 +615,86 @@ class AIContentProcessor:
     
     def _parse_srt(self, srt_path: str) -> List[Dict]:
         """Parse SRT file into structured data"""
-        with open(srt_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        return self._parse_srt_from_text(content)
-    
-    def _parse_srt_from_text(self, content: str) -> List[Dict]:
-        """Parse SRT text content into structured data"""
-        # Split by double newline to get subtitle blocks
-        blocks = re.split(r'\n\n+', content.strip())
-        subtitles = []
-        
-        for block in blocks:
-            lines = block.strip().split('\n')
-            if len(lines) >= 3:
-                try:
-                    index = int(lines[0])
-                    timestamp = lines[1]
-                    text = '\n'.join(lines[2:])
-                    subtitles.append({
+        return list(self._iter_srt(srt_path))
+
+    def _iter_srt(self, srt_path: str):
+        """Yield subtitle dicts from an SRT file one block at a time
+
+        A small line-by-line state machine, so a multi-hour transcript
+        never sits in memory as one big str plus its split copies —
+        callers that only stream the text (summary extraction) consume
+        blocks as they are read. Malformed blocks are skipped, matching
+        _parse_srt_from_text.
+        """
+        index: Optional[int] = None
+        timestamp: Optional[str] = None
+        text_lines: List[str] = []
+        # 1 MiB buffer (matching _write_srt) so multi-MB transcripts
+        # are pulled in a handful of reads instead of per-block chunks
+        with open(srt_path, 'r', encoding='utf-8', buffering=1 << 20) as f:
+            for line in f:
+                stripped = line.strip()
+                if index is None:
+                    # Between blocks: wait for a numeric index line
+                    if stripped.isdigit():
+                        index = int(stripped)
+                elif timestamp is None:
+                    if '-->' in stripped:
+                        timestamp = stripped
+                    else:
+                        # Malformed block; this line may itself start one
+                        index = int(stripped) if stripped.isdigit() else None
+                elif not stripped:
+                    yield {
                         'index': index,
                         'timestamp': timestamp,
-                        'text': text
-                    })
-                except ValueError:
-                    continue
-        
-        return subtitles
+                        'text': '\n'.join(text_lines).strip()
+                    }
+                    index = None
+                    timestamp = None
+                    text_lines = []
+                else:
+                    text_lines.append(line.rstrip('\n'))
+
+        if index is not None and timestamp is not None:
+            yield {
+                'index': index,
+                'timestamp': timestamp,
+                'text': '\n'.join(text_lines).strip()
+            }
+    
+    def _parse_srt_from_text(self, content: str) -> List[Dict]:
+        """Parse SRT text content into structured data
+
+        A single compiled-regex pass over the whole buffer; malformed
+        blocks (non-numeric index, missing timestamp arrow) simply
+        don't match and are skipped, as before.
+        """
+        return [
+            {
+                'index': int(m[1]),
+                'timestamp': m[2].strip(),
+                'text': m[3].strip()
+            }
+            for m in _SRT_BLOCK_RE.finditer(content.strip())
+        ]
     
     def _write_srt(self, subtitles: List[Dict], output_path: str):
         """Write structured data back to SRT format"""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for sub in subtitles:
-                f.write(f"{sub['index']}\n")
-                f.write(f"{sub['timestamp']}\n")
-                f.write(f"{sub['text']}\n\n")
+        # One formatted string per block joined into a single write —
+        # four buffered writes per subtitle add up on long sermons
+        payload = ''.join(
+            f"{sub['index']}\n{sub['timestamp']}\n{sub['text']}\n\n"
+            for sub in subtitles
+        )
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(payload)
     
     def correct_subtitles(
         self,
         srt_path: str,
         output_dir: str,
-        batch_size: int = 10
+        batch_size: int = 32
     ) -> Tuple[bool, Optional[str], Dict[str, str]]:
         """
         Correct subtitles using AI
@@ -152,123 +708,185 @@ class AIContentProcessor:
             (success, error_message, output_files)
         """
         try:
-            if not self._check_ollama_available():
-                return False, "Ollama service not available", {}
-            
-            if not self._check_model_available():
-                return False, f"Model {self.model} not available", {}
+            error = self._ensure_available()
+            if error:
+                return False, error, {}
             
             self.logger.info(f"Correcting subtitles: {srt_path}")
-            
+            stage_model = self._stage_model(self.correction_model)
+
+            output_path = Path(output_dir)
+            output_path.mkdir(parents=True, exist_ok=True)
+
+            base_name = Path(srt_path).stem
+            if base_name.endswith('_audio'):
+                base_name = base_name[:-6]
+
+            # Content-addressed output: the same SRT bytes, model and
+            # prompt always map to the same filename, so a re-run over
+            # unchanged inputs is answered from disk
+            self._last_corrected = None
+
+            content_hash = self._content_hash(
+                srt_path, stage_model or self.model, self.CORRECTION_SYSTEM_PROMPT
+            )
+            corrected_srt = output_path / f"{base_name}_corrected_{content_hash}.srt"
+            if corrected_srt.exists():
+                self.logger.info(f"Reusing corrected SRT (inputs unchanged): {corrected_srt}")
+                return True, None, {"corrected_srt": str(corrected_srt)}
+
             # Parse SRT
             subtitles = self._parse_srt(srt_path)
             if not subtitles:
                 return False, "Failed to parse SRT file", {}
             
             self.logger.info(f"Parsed {len(subtitles)} subtitle segments")
-            
-            # Use batch processing for better reliability (smaller batches = better format compliance)
-            corrected_subtitles = []
-            batch_size = 10  # Process 10 subtitle blocks at a time
-            
-            for batch_start in range(0, len(subtitles), batch_size):
-                batch_end = min(batch_start + batch_size, len(subtitles))
-                batch = subtitles[batch_start:batch_end]
-                
-                # Convert batch to SRT text
-                srt_text = ""
-                for sub in batch:
-                    srt_text += f"{sub['index']}\n"
-                    srt_text += f"{sub['timestamp']}\n"
-                    srt_text += f"{sub['text']}\n\n"
-                
-                # Prepare strict prompt with example
-                system_prompt = """You are a subtitle text correction assistant. Fix ONLY the subtitle text content while preserving the exact SRT format.
 
-CRITICAL RULES:
-1) Keep the EXACT number of subtitle blocks
-2) Keep ALL timestamps unchanged
-3) Keep ALL index numbers unchanged  
-4) Keep ALL blank lines between blocks
-5) ONLY fix: typos, ASR errors, grammar, unnatural wording
-6) Output VALID SRT format
+            # Trivial segments — bracket markers like [Music] and short
+            # interjections ("Amen.") — come back unchanged or
+            # hallucinated on, so they pass through verbatim. The
+            # character guard keeps unspaced CJK lines in scope even
+            # though they split to one "word".
+            to_process = []
+            skipped_count = 0
+            for sub in subtitles:
+                text = sub['text'].strip()
+                if not text or _BRACKET_RE.match(text) or (
+                    len(text.split()) < 3 and len(text) < 10
+                ):
+                    skipped_count += 1
+                else:
+                    to_process.append(sub)
+            if skipped_count:
+                self.logger.info(f"Skipping correction for {skipped_count} trivial segments")
 
-Example input:
-1
-00:00:00,000 --> 00:00:02,300
-李政階妹平安
+            # Batch processing keeps format compliance manageable while
+            # amortizing HTTP/prompt overhead; larger batches mean fewer
+            # round-trips on short videos. Start from the size learned
+            # on previous runs when one exists, then pack greedily by
+            # token budget so wordy segments don't blow past the
+            # context window while terse ones still fill a request.
+            if self._last_good_batch:
+                batch_size = self._last_good_batch
+            batches = self._pack_batches(to_process, max_blocks=batch_size)
 
-2
-00:00:02,300 --> 00:00:05,900
-感謝祝我們來到他的面前
+            # Clean-looking batches skip the model entirely: the final
+            # merge keeps the original text for anything not corrected,
+            # so not dispatching a batch just passes it through
+            dispatched_before = len(batches)
+            batches = [b for b in batches if self._needs_correction(b)]
+            if len(batches) < dispatched_before:
+                self.logger.info(
+                    f"Skipping {dispatched_before - len(batches)} clean batches"
+                )
+            dispatched = sum(len(b) for b in batches)
 
-Example output (same structure, corrected text):
-1
-00:00:00,000 --> 00:00:02,300
-李政道妹平安
+            # Prepare strict prompt with example
+            system_prompt = self.CORRECTION_SYSTEM_PROMPT
 
-2
-00:00:02,300 --> 00:00:05,900
-感謝主我們來到他的面前"""
-                
-                prompt = f"""Correct the subtitle text. Output MUST have exactly {len(batch)} blocks with same timestamps and numbers.
+            prompts = [self._batch_prompt(batch) for batch in batches]
 
-Input SRT ({len(batch)} blocks):
-<<<
-{srt_text.strip()}
->>>
+            # Fan all batches out concurrently instead of blocking on
+            # full generation latency per batch; order is preserved by
+            # gather so validation below lines up with the originals
+            self.logger.info(f"Correcting {len(batches)} batches concurrently")
+            started = time.monotonic()
+            responses = self._fanout_prompts(prompts, system_prompt, model=stage_model)
+            elapsed = time.monotonic() - started
 
-Output corrected SRT (MUST be {len(batch)} blocks, same format):"""
-                
-                self.logger.info(f"Correcting batch {batch_start//batch_size + 1} ({len(batch)} segments)")
-                
-                corrected_batch_text = self._call_ollama(prompt, system_prompt)
-                
+            corrected_subtitles = []
+            failed_batches = 0
+            total_misses = 0
+            retry_subs: List[Tuple[int, Dict]] = []
+            for batch, corrected_batch_text in zip(batches, responses):
                 if not corrected_batch_text:
                     self.logger.warning(f"AI correction failed for batch, keeping original")
                     corrected_subtitles.extend(batch)
+                    failed_batches += 1
                     continue
-                
+
                 # Parse AI response
                 try:
                     corrected_batch = self._parse_srt_from_text(corrected_batch_text)
-                    
-                    # Strict validation: must match batch size
-                    if len(corrected_batch) != len(batch):
-                        self.logger.warning(
-                            f"Batch structure mismatch (expected {len(batch)}, got {len(corrected_batch)}), "
-                            f"keeping original batch"
-                        )
-                        corrected_subtitles.extend(batch)
-                    else:
-                        # Verify timestamps match
-                        timestamps_match = all(
-                            orig['timestamp'] == corr['timestamp'] 
-                            for orig, corr in zip(batch, corrected_batch)
-                        )
-                        if not timestamps_match:
-                            self.logger.warning("Timestamps changed in AI output, keeping original batch")
-                            corrected_subtitles.extend(batch)
-                        else:
-                            # Success - use corrected batch
-                            corrected_subtitles.extend(corrected_batch)
-                            self.logger.info(f"Batch corrected successfully")
-                            
                 except Exception as e:
                     self.logger.error(f"Failed to parse batch response: {e}, keeping original")
                     corrected_subtitles.extend(batch)
-            
-            # Write corrected SRT
-            output_path = Path(output_dir)
-            output_path.mkdir(parents=True, exist_ok=True)
-            
-            base_name = Path(srt_path).stem
-            if base_name.endswith('_audio'):
-                base_name = base_name[:-6]
-            
-            corrected_srt = output_path / f"{base_name}_corrected.srt"
-            self._write_srt(corrected_subtitles, str(corrected_srt))
-            
+                    failed_batches += 1
+                    continue
+
+                # Key returned blocks by index instead of assuming one
+                # in-order block per input. The original index and
+                # timestamp are always kept, so a renumbered, reordered
+                # or partially-returned response can at worst leave a
+                # block uncorrected — never shift a correction onto the
+                # wrong cue or discard the whole batch
+                by_index = {corr['index']: corr['text'] for corr in corrected_batch}
+                misses = 0
+                for sub in batch:
+                    text = by_index.get(sub['index'])
+                    if text is None:
+                        misses += 1
+                        retry_subs.append((len(corrected_subtitles), sub))
+                        text = sub['text']
+                    corrected_subtitles.append({
+                        'index': sub['index'],
+                        'timestamp': sub['timestamp'],
+                        'text': text
+                    })
+
+                if misses:
+                    total_misses += misses
+                    failed_batches += 1
+                    self.logger.warning(
+                        f"Model dropped {misses}/{len(batch)} blocks in batch"
+                    )
+                else:
+                    self.logger.info(f"Batch corrected successfully")
+
+            # Segments the model dropped get one retry as single-block
+            # batches — the format the model can no longer misalign —
+            # so a misformatted response costs a small retry round
+            # instead of silently losing those corrections
+            recovered = 0
+            if retry_subs:
+                self.logger.warning(f"Retrying {len(retry_subs)} dropped segments individually")
+                retry_responses = self._fanout_prompts(
+                    [self._batch_prompt([sub]) for _, sub in retry_subs],
+                    system_prompt,
+                    model=stage_model
+                )
+                for (pos, sub), response in zip(retry_subs, retry_responses):
+                    if not response:
+                        continue
+                    parsed = self._parse_srt_from_text(response)
+                    if len(parsed) == 1 and parsed[0]['index'] == sub['index']:
+                        corrected_subtitles[pos]['text'] = parsed[0]['text']
+                        recovered += 1
+
+            if total_misses:
+                # Miss rate doubles as a batch-quality signal: any batch
+                # with misses counts as failed for the adaptive sizing
+                self.logger.info(
+                    f"Correction misses: {total_misses}/{len(subtitles)} blocks, "
+                    f"{recovered} recovered by per-segment retry"
+                )
+
+            if dispatched:
+                self._tune_batch_size(batch_size, failed_batches, elapsed / dispatched)
+
+            # Merge corrected segments back over the originals in file
+            # order; skipped segments simply keep their original entry
+            corrected_by_index = {sub['index']: sub for sub in corrected_subtitles}
+            merged = [corrected_by_index.get(sub['index'], sub) for sub in subtitles]
+
+            # Drop corrected files from earlier inputs so downstream
+            # globs cannot pick a stale one, then write the new output
+            for stale in output_path.glob(f"{base_name}_corrected*.srt"):
+                if stale != corrected_srt:
+                    stale.unlink()
+            self._write_srt(merged, str(corrected_srt))
+            self._last_corrected = (str(corrected_srt), merged)
+
             self.logger.info(f"Corrected SRT saved to: {corrected_srt}")
             
             return True, None, {"corrected_srt": str(corrected_srt)}
@@ -278,31 +896,167 @@ Output corrected SRT (MUST be {len(batch)} blocks, same format):"""
             self.logger.error(error_msg, exc_info=True)
             return False, error_msg, {}
     
+    def _tune_batch_size(self, batch_size: int, failed_batches: int, per_segment: float) -> None:
+        """Adapt the correction batch size from the last run's outcome
+
+        Validation failures (format breaks, timestamp drift, errors)
+        halve the learned size — larger batches are where the model
+        loses format compliance. A clean run whose latency per segment
+        beat the running EMA by at least 5% grows it 25%; otherwise it
+        is kept, which gives hysteresis against oscillation.
+        """
+        if failed_batches:
+            self._last_good_batch = max(self.MIN_BATCH_SIZE, batch_size // 2)
+            self.logger.info(
+                f"{failed_batches} correction batches failed validation, "
+                f"shrinking batch size to {self._last_good_batch}"
+            )
+            return
+
+        improved = self._latency_ema is None or per_segment < self._latency_ema * 0.95
+        if self._latency_ema is None:
+            self._latency_ema = per_segment
+        else:
+            self._latency_ema = 0.8 * self._latency_ema + 0.2 * per_segment
+
+        if improved:
+            self._last_good_batch = min(self.MAX_BATCH_SIZE, max(batch_size + 1, batch_size * 5 // 4))
+        else:
+            self._last_good_batch = batch_size
+
+    def _chunk_text(self, text: str, max_tokens: int = 2000) -> List[str]:
+        """Split text into ~max_tokens chunks on sentence boundaries
+
+        Uses len(chunk) // 4 as a cheap token-count proxy, which is
+        close enough for budgeting prompts against the model's context
+        window without pulling in a tokenizer.
+        """
+        limit = max_tokens * 4
+        sentences = _SENTENCE_RE.split(text)
+        chunks = []
+        current: List[str] = []
+        current_len = 0
+        for sentence in sentences:
+            if current and current_len + len(sentence) > limit:
+                chunks.append(' '.join(current))
+                current = []
+                current_len = 0
+            current.append(sentence)
+            current_len += len(sentence) + 1
+        if current:
+            chunks.append(' '.join(current))
+        return chunks
+
+    def _condense_transcript(self, full_text: str, model: Optional[str] = None) -> str:
+        """Map step of map-reduce summarization for long transcripts
+
+        A 60-minute sermon easily exceeds the model's context window
+        when sent as one prompt, forcing silent truncation on the
+        server. Split into ~2k-token chunks, condense each chunk
+        concurrently, and hand the joined condensations to the normal
+        summary prompt as the reduce step. Transcripts that fit in a
+        single chunk pass through untouched; a failed chunk falls back
+        to its raw text so no content is lost.
+        """
+        chunks = self._chunk_text(full_text)
+        if len(chunks) <= 1:
+            return full_text
+
+        self.logger.info(f"Transcript too long for one prompt, condensing {len(chunks)} chunks")
+
+        system_prompt = """You are condensing one portion of a sermon transcript.
+
+Your task: Compress this portion to its core points, keeping only what the speaker explicitly said. Do not add interpretations, conclusions, or content from outside this portion. Keep the speaker's original language."""
+
+        prompts = [
+            f"""Condense the following portion of a sermon transcript. State only what the speaker said, in order, without adding anything.
+
+Transcript portion:
+{chunk}
+
+Condensed version:"""
+            for chunk in chunks
+        ]
+
+        responses = self._fanout_prompts(prompts, system_prompt, model=model)
+        failed = sum(1 for r in responses if not r)
+        if failed:
+            self.logger.warning(f"{failed}/{len(chunks)} chunk condensations failed, using raw text for those")
+
+        return '\n\n'.join(
+            response if response else chunk
+            for response, chunk in zip(responses, chunks)
+        )
+
+    @staticmethod
+    def _summary_system_prompt(lang_name: str) -> str:
+        """System prompt for one language's summary"""
+        return f"""You are creating a faithful summary of a sermon transcript.
+
+Your task: Produce a "compressed sermon notes version" — not a rewritten sermon and not a theological commentary.
+
+Write the entire summary in {lang_name}."""
+
+    @staticmethod
+    def _summary_prompt(lang_name: str, length_instruction: str, transcript: str) -> str:
+        """User prompt for one language's summary
+
+        Built in a StringIO buffer so the transcript is copied into the
+        prompt exactly once per language.
+        """
+        buf = io.StringIO()
+        buf.write(f"""Please create {length_instruction} of the following sermon, following these requirements strictly:
+
+1. Summarize only what is explicitly stated in the sermon. Do not add biblical interpretations, theological views, or personal explanations that were not mentioned by the speaker.
+
+2. Do not expand, elaborate, or systematize the content theologically. Only compress what the preacher already said.
+
+3. If the preacher uses examples, illustrations, or background explanations, they may be briefly retained, but do not introduce any new examples or background information.
+
+4. Do not include application-style conclusions such as "this shows that," "this symbolizes," or "this reminds us," unless the preacher explicitly said them.
+
+5. Organize the summary into clear paragraphs for readability, but ensure the meaning remains completely faithful to the original sermon.
+
+6. If a section of the sermon is long, extract only its core point without inferring any unstated implications.
+
+7. If something in the sermon is presented merely as an example or illustration, do not turn it into a separate main point; it may only be mentioned briefly within the relevant section.
+
+8. Do not elevate the preacher's illustrations into formal theological concepts or doctrinal statements.
+
+IMPORTANT: Write the entire summary in {lang_name}.
+
+Sermon transcript:
+""")
+        buf.write(transcript)
+        buf.write(f"\n\nSummary in {lang_name}:")
+        return buf.getvalue()
+
     def generate_summary(
         self,
         srt_path: str,
         output_dir: str,
         summary_length: str = "medium",
-        languages: List[str] = None
+        languages: List[str] = None,
+        subtitles: Optional[List[Dict]] = None
     ) -> Tuple[bool, Optional[str], Dict[str, str]]:
         """
         Generate content summary from subtitles in multiple languages
-        
+
         Args:
             srt_path: Path to subtitle file (SRT, TXT, or VTT - TXT is preferred for better text extraction)
             output_dir: Directory to save summary
             summary_length: "short", "medium", or "long"
             languages: List of language codes (e.g., ["en", "zh", "es"]). If None, defaults to ["en"]
-            
+            subtitles: Already-parsed blocks for srt_path, skipping the re-read
+
         Returns:
             (success, error_message, output_files)
         """
         try:
-            if not self._check_ollama_available():
-                return False, "Ollama service not available", {}
-            
-            if not self._check_model_available():
-                return False, f"Model {self.model} not available", {}
+            error = self._ensure_available()
+            if error:
+                return False, error, {}
+            stage_model = self._stage_model(self.summary_model)
             
             # Default to English if no languages specified
             if not languages:
@@ -336,14 +1090,20 @@ Output corrected SRT (MUST be {len(batch)} blocks, same format):"""
                 with open(txt_file, 'r', encoding='utf-8') as f:
                     full_text = f.read()
                 source_file = txt_file
+            elif subtitles is not None:
+                # Blocks were parsed in this run's correction stage;
+                # reuse them instead of re-reading the file just written
+                self.logger.info("Using in-memory corrected subtitles")
+                full_text = ' '.join(sub['text'] for sub in subtitles)
+                if not full_text:
+                    return False, "Failed to parse subtitle file", {}
             else:
-                # Fallback to parsing SRT/VTT file
+                # Fallback to parsing SRT/VTT file, streamed block by
+                # block so the list of dicts is never materialized
                 self.logger.info(f"No TXT file found, parsing subtitle file: {srt_path}")
-                subtitles = self._parse_srt(srt_path)
-                if not subtitles:
+                full_text = ' '.join(sub['text'] for sub in self._iter_srt(srt_path))
+                if not full_text:
                     return False, "Failed to parse subtitle file", {}
-                
-                full_text = ' '.join([sub['text'] for sub in subtitles])
             
             # Determine summary length instructions
             length_instructions = {
@@ -358,72 +1118,82 @@ Output corrected SRT (MUST be {len(batch)} blocks, same format):"""
             output_path.mkdir(parents=True, exist_ok=True)
             
             base_name = source_file.stem
-            if base_name.endswith('_corrected'):
-                base_name = base_name[:-10]
+            trimmed = _CORRECTED_SUFFIX_RE.sub('', base_name)
+            if trimmed != base_name:
+                base_name = trimmed
             elif base_name.endswith('_audio'):
                 base_name = base_name[:-6]
-            
-            output_files = {}
-            
-            # Generate summary for each requested language
-            for lang_code in languages:
-                lang_name = language_names.get(lang_code, lang_code)
-                self.logger.info(f"Generating {lang_name} summary...")
-                
-                system_prompt = f"""You are creating a faithful summary of a sermon transcript.
 
-Your task: Produce a "compressed sermon notes version" — not a rewritten sermon and not a theological commentary.
+            output_files = {}
 
-Write the entire summary in {lang_name}."""
-                
-                prompt = f"""Please create {length_instruction} of the following sermon, following these requirements strictly:
+            # Map step: condense long transcripts once, shared across
+            # all requested languages; computed lazily so fully-cached
+            # runs never touch the model. The length instruction
+            # applies only to the reduce prompt below.
+            reduce_source = None
 
-1. Summarize only what is explicitly stated in the sermon. Do not add biblical interpretations, theological views, or personal explanations that were not mentioned by the speaker.
+            # Pass 1: resolve filenames and reuse cached summaries, so
+            # only the languages that actually need generation remain
+            pending = []
+            for lang_code in languages:
+                lang_name = language_names.get(lang_code, lang_code)
 
-2. Do not expand, elaborate, or systematize the content theologically. Only compress what the preacher already said.
+                if len(languages) == 1:
+                    summary_file = output_path / f"{base_name}_summary.txt"
+                else:
+                    summary_file = output_path / f"{base_name}_summary_{lang_code}.txt"
 
-3. If the preacher uses examples, illustrations, or background explanations, they may be briefly retained, but do not introduce any new examples or background information.
+                # Sidecar hash keeps the published filename stable
+                # (downstream globs *_summary.txt) while letting an
+                # unchanged source + model + length reuse the file
+                summary_hash = self._content_hash(
+                    str(source_file), stage_model or self.model, summary_length, lang_code
+                )
+                hash_file = Path(f"{summary_file}.hash")
+                try:
+                    cached = hash_file.read_text(encoding='utf-8').strip()
+                except OSError:
+                    cached = None
+                if cached == summary_hash and summary_file.exists():
+                    self.logger.info(f"Reusing {lang_name} summary (inputs unchanged)")
+                    output_files[f"summary_{lang_code}"] = str(summary_file)
+                    continue
 
-4. Do not include application-style conclusions such as "this shows that," "this symbolizes," or "this reminds us," unless the preacher explicitly said them.
+                pending.append((lang_code, lang_name, summary_file, hash_file, summary_hash))
 
-5. Organize the summary into clear paragraphs for readability, but ensure the meaning remains completely faithful to the original sermon.
+            # Pass 2: the language prompts are independent, so they all
+            # go through one concurrent fan-out — wall time approaches
+            # the slowest language instead of the sum of all of them
+            if pending:
+                if reduce_source is None:
+                    reduce_source = self._condense_transcript(full_text, model=stage_model)
 
-6. If a section of the sermon is long, extract only its core point without inferring any unstated implications.
+                prompts = []
+                system_prompts = []
+                for lang_code, lang_name, _, _, _ in pending:
+                    system_prompts.append(self._summary_system_prompt(lang_name))
+                    prompts.append(self._summary_prompt(lang_name, length_instruction, reduce_source))
 
-7. If something in the sermon is presented merely as an example or illustration, do not turn it into a separate main point; it may only be mentioned briefly within the relevant section.
+                self.logger.info(f"Generating {len(pending)} language summaries concurrently")
+                responses = self._fanout_prompts(prompts, system_prompts, model=stage_model)
 
-8. Do not elevate the preacher's illustrations into formal theological concepts or doctrinal statements.
+                for (lang_code, lang_name, summary_file, hash_file, summary_hash), summary_text in zip(pending, responses):
+                    if not summary_text:
+                        self.logger.warning(f"Failed to generate {lang_name} summary")
+                        continue
 
-IMPORTANT: Write the entire summary in {lang_name}.
+                    with open(summary_file, 'w', encoding='utf-8') as f:
+                        f.write(f"# Content Summary ({lang_name})\n\n")
+                        f.write(f"Generated from: {source_file.name}\n")
+                        f.write(f"Summary length: {summary_length}\n")
+                        f.write(f"Language: {lang_name}\n\n")
+                        f.write("---\n\n")
+                        f.write(summary_text)
+                    hash_file.write_text(summary_hash, encoding='utf-8')
 
-Sermon transcript:
-{full_text}
+                    self.logger.info(f"{lang_name} summary saved to: {summary_file}")
+                    output_files[f"summary_{lang_code}"] = str(summary_file)
 
-Summary in {lang_name}:"""
-                
-                summary_text = self._call_ollama(prompt, system_prompt)
-                
-                if not summary_text:
-                    self.logger.warning(f"Failed to generate {lang_name} summary")
-                    continue
-                
-                # Save summary with language code
-                if len(languages) == 1:
-                    summary_file = output_path / f"{base_name}_summary.txt"
-                else:
-                    summary_file = output_path / f"{base_name}_summary_{lang_code}.txt"
-                
-                with open(summary_file, 'w', encoding='utf-8') as f:
-                    f.write(f"# Content Summary ({lang_name})\n\n")
-                    f.write(f"Generated from: {source_file.name}\n")
-                    f.write(f"Summary length: {summary_length}\n")
-                    f.write(f"Language: {lang_name}\n\n")
-                    f.write("---\n\n")
-                    f.write(summary_text)
-                
-                self.logger.info(f"{lang_name} summary saved to: {summary_file}")
-                output_files[f"summary_{lang_code}"] = str(summary_file)
-            
             # Generate image prompt for thumbnail (only once, use first language)
             if languages:
                 self.logger.info("Generating image prompt for thumbnail...")
@@ -506,7 +1276,7 @@ Create a prompt that visually represents the sermon's main theme. Output ONLY th
         generate_summary: bool = True,
         summary_length: str = "medium",
         summary_languages: List[str] = None,
-        batch_size: int = 10,
+        batch_size: int = 32,
         unload_model_after: bool = False
     ) -> Tuple[bool, Optional[str], Dict[str, str]]:
         """
@@ -539,14 +1309,20 @@ Create a prompt that visually represents the sermon's main theme. Output ONLY th
                 srt_for_summary = files.get("corrected_srt", srt_path)
             else:
                 srt_for_summary = srt_path
-            
+
             # Step 2: Generate summary
             if generate_summary:
+                # Reuse the blocks correction just parsed and wrote, if
+                # they match the file the summary will read
+                parsed = None
+                if self._last_corrected and self._last_corrected[0] == srt_for_summary:
+                    parsed = self._last_corrected[1]
                 success, error, files = self.generate_summary(
-                    srt_for_summary, 
-                    output_dir, 
+                    srt_for_summary,
+                    output_dir,
                     summary_length,
-                    summary_languages
+                    summary_languages,
+                    subtitles=parsed
                 )
                 if not success:
                     return False, f"Summary generation failed: {error}", output_files
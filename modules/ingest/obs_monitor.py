@@ -2,31 +2,108 @@
 OBS Monitor - Watches recording folder for new files
 """
 
+import signal
+import threading
 import time
 import logging
 from pathlib import Path
-from typing import Callable, Optional
-from watchdog.observers import Observer
+from typing import Callable, Dict, Optional, Tuple
+# Pin the kernel-event backend where one exists: watchdog's automatic
+# selection can silently fall back to stat-polling the whole recording
+# folder, which gets expensive once a season of services piles up.
+# inotify delivers events O(1) from the kernel instead.
+try:
+    from watchdog.observers.inotify import InotifyObserver as Observer
+except ImportError:
+    from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
 
 
 class RecordingHandler(FileSystemEventHandler):
-    """Handles file system events for new recordings"""
-    
+    """Handles file system events for new recordings
+
+    OBS creates the file the moment recording starts and then writes to
+    it for the length of the service, so firing the callback from
+    on_created hands downstream tools a 0-byte or still-growing file.
+    Instead, detected files sit in a pending set until their size has
+    been stable for STABLE_SECONDS; only then does the callback run.
+    """
+
+    # How long a file's size must hold still before it counts as done
+    STABLE_SECONDS = 5.0
+    # How often the watcher thread re-checks pending files
+    POLL_INTERVAL = 1.0
+
     def __init__(self, callback: Callable[[str], None], extensions: tuple = ('.mp4', '.mkv', '.mov')):
         self.callback = callback
         self.extensions = extensions
         self.logger = logging.getLogger("RecordingHandler")
-    
+        # path -> (last seen size, monotonic time the size last changed)
+        self._pending: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self._watcher = threading.Thread(target=self._watch_pending, daemon=True)
+        self._watcher.start()
+
     def on_created(self, event: FileSystemEvent):
         """Called when a new file is created"""
         if event.is_directory:
             return
-        
-        file_path = Path(event.src_path)
-        if file_path.suffix.lower() in self.extensions:
-            self.logger.info(f"New recording detected: {file_path}")
-            self.callback(str(file_path))
+        self._track(event.src_path, announce=True)
+
+    def on_modified(self, event: FileSystemEvent):
+        """Called on every write — refreshes the stability clock"""
+        if event.is_directory:
+            return
+        self._track(event.src_path)
+
+    def on_moved(self, event: FileSystemEvent):
+        """Called on rename — OBS sometimes renames .tmp to the final name"""
+        if event.is_directory:
+            return
+        with self._lock:
+            self._pending.pop(event.src_path, None)
+        self._track(event.dest_path, announce=True)
+
+    def _track(self, path: str, announce: bool = False):
+        """Record or refresh a pending file's size snapshot"""
+        file_path = Path(path)
+        if file_path.suffix.lower() not in self.extensions:
+            return
+        try:
+            size = file_path.stat().st_size
+        except OSError:
+            return
+        with self._lock:
+            known = self._pending.get(path)
+            if known is None:
+                if announce:
+                    self.logger.info(f"New recording detected: {file_path} (waiting for write to finish)")
+                self._pending[path] = (size, time.monotonic())
+            elif known[0] != size:
+                self._pending[path] = (size, time.monotonic())
+
+    def _watch_pending(self):
+        """Fire the callback once a pending file's size stops changing"""
+        while True:
+            time.sleep(self.POLL_INTERVAL)
+            now = time.monotonic()
+            ready = []
+            with self._lock:
+                for path, (size, last_change) in list(self._pending.items()):
+                    try:
+                        current = Path(path).stat().st_size
+                    except OSError:
+                        # Deleted or renamed away mid-write
+                        del self._pending[path]
+                        continue
+                    if current != size:
+                        self._pending[path] = (current, now)
+                    elif current > 0 and now - last_change >= self.STABLE_SECONDS:
+                        del self._pending[path]
+                        ready.append(path)
+            for path in ready:
+                self.logger.info(f"Recording complete: {path}")
+                self.callback(path)
 
 
 class OBSMonitor:
@@ -72,13 +149,16 @@ class OBSMonitor:
             self.logger.info("OBS monitor stopped")
     
     def run(self):
-        """Run monitor in blocking mode"""
+        """Run monitor in blocking mode
+
+        Blocks on the observer thread instead of a wake-every-second
+        sleep loop — the process sits fully idle between filesystem
+        events. Ctrl+C is handled via a SIGINT handler that stops the
+        observer, which unblocks the join.
+        """
         self.start()
-        try:
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            self.stop()
+        signal.signal(signal.SIGINT, lambda *_: self.stop())
+        self.observer.join()
 
 
 def main():
@@ -2,7 +2,16 @@
 OBS Control - Optional OBS WebSocket control
 """
 
+import asyncio
+import json
 import logging
+import os
+import random
+import signal
+import socket
+import socketserver
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 try:
     from obswebsocket import obsws, requests
@@ -10,6 +19,14 @@ try:
 except ImportError:
     OBS_AVAILABLE = False
 
+# Module-level logger; %s-style arguments defer formatting until the
+# record is actually emitted
+log = logging.getLogger(__name__)
+
+# Unix socket the control daemon listens on; CLI invocations talk to it
+# instead of paying a fresh WebSocket handshake per command
+DEFAULT_SOCKET = "/tmp/cmas-obs.sock"
+
 
 class OBSControl:
     """Controls OBS via WebSocket for automated streaming/recording"""
@@ -30,84 +47,130 @@ class OBSControl:
         self.port = port
         self.password = password
         self.ws: Optional[obsws] = None
-        self.logger = self._setup_logger()
-    
-    def _setup_logger(self) -> logging.Logger:
-        logger = logging.getLogger("OBSControl")
-        logger.setLevel(logging.INFO)
-        return logger
+        self._executor: Optional[ThreadPoolExecutor] = None
     
-    def connect(self) -> bool:
-        """Connect to OBS WebSocket"""
-        try:
+    def connect(self, retries: int = 6, base: float = 0.5) -> bool:
+        """Connect to OBS WebSocket with exponential backoff
+
+        OBS is frequently still starting when the automation fires
+        (right before a livestream), and a single-shot connect pushed
+        retrying onto callers — typically a tight sleep(1) loop that
+        hammers the port and spams the OBS log. Delays double per
+        attempt with jitter, capped at 30s; the obsws instance is
+        reused across attempts so obs-websocket-py does not leak a
+        receiver thread per try.
+        """
+        if self.ws is None:
             self.ws = obsws(self.host, self.port, self.password)
-            self.ws.connect()
-            self.logger.info(f"Connected to OBS at {self.host}:{self.port}")
-            return True
-        except Exception as e:
-            self.logger.error(f"Failed to connect to OBS: {e}")
-            return False
+        for attempt in range(retries):
+            try:
+                self.ws.connect()
+                self._tune_socket()
+                log.info("Connected to OBS at %s:%s", self.host, self.port)
+                return True
+            except Exception as e:
+                if attempt + 1 >= retries:
+                    log.error("Failed to connect to OBS: %s", e)
+                    break
+                delay = min(30.0, base * (2 ** attempt)) + random.uniform(0, base)
+                log.warning(
+                    "OBS connect failed (%d/%d): %s; retrying in %.2fs",
+                    attempt + 1, retries, e, delay
+                )
+                time.sleep(delay)
+        return False
+
+    def connect_nowait(self) -> bool:
+        """Single connect attempt, no retries (original behavior)"""
+        return self.connect(retries=1)
+
+    def _tune_socket(self):
+        """Disable Nagle and enable keepalive on the OBS socket
+
+        The JSON command frames are tiny, so Nagle's algorithm can sit
+        on them for ~40 ms waiting for more data — pure added latency on
+        every scene switch. Keepalive (with aggressive timing where the
+        platform exposes it) surfaces a dead OBS peer in seconds instead
+        of on the next blocking call. Best-effort: the raw socket is an
+        implementation detail of the client library.
+        """
+        try:
+            sock = self.ws.ws.sock
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            for opt, value in (
+                ("TCP_KEEPIDLE", 30),
+                ("TCP_KEEPINTVL", 10),
+                ("TCP_KEEPCNT", 3)
+            ):
+                if hasattr(socket, opt):
+                    sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, opt), value)
+        except (AttributeError, OSError) as e:
+            log.debug("Could not tune OBS socket: %s", e)
     
     def disconnect(self):
         """Disconnect from OBS WebSocket"""
         if self.ws:
             self.ws.disconnect()
-            self.logger.info("Disconnected from OBS")
+            log.info("Disconnected from OBS")
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
     
     def start_recording(self) -> bool:
         """Start recording in OBS"""
         if not self.ws:
-            self.logger.error("Not connected to OBS")
+            log.error("Not connected to OBS")
             return False
         
         try:
             self.ws.call(requests.StartRecord())
-            self.logger.info("Recording started")
+            log.info("Recording started")
             return True
         except Exception as e:
-            self.logger.error(f"Failed to start recording: {e}")
+            log.error("Failed to start recording: %s", e)
             return False
     
     def stop_recording(self) -> bool:
         """Stop recording in OBS"""
         if not self.ws:
-            self.logger.error("Not connected to OBS")
+            log.error("Not connected to OBS")
             return False
         
         try:
             self.ws.call(requests.StopRecord())
-            self.logger.info("Recording stopped")
+            log.info("Recording stopped")
             return True
         except Exception as e:
-            self.logger.error(f"Failed to stop recording: {e}")
+            log.error("Failed to stop recording: %s", e)
             return False
     
     def start_streaming(self) -> bool:
         """Start streaming in OBS"""
         if not self.ws:
-            self.logger.error("Not connected to OBS")
+            log.error("Not connected to OBS")
             return False
         
         try:
             self.ws.call(requests.StartStream())
-            self.logger.info("Streaming started")
+            log.info("Streaming started")
             return True
         except Exception as e:
-            self.logger.error(f"Failed to start streaming: {e}")
+            log.error("Failed to start streaming: %s", e)
             return False
     
     def stop_streaming(self) -> bool:
         """Stop streaming in OBS"""
         if not self.ws:
-            self.logger.error("Not connected to OBS")
+            log.error("Not connected to OBS")
             return False
         
         try:
             self.ws.call(requests.StopStream())
-            self.logger.info("Streaming stopped")
+            log.info("Streaming stopped")
             return True
         except Exception as e:
-            self.logger.error(f"Failed to stop streaming: {e}")
+            log.error("Failed to stop streaming: %s", e)
             return False
     
     def set_scene(self, scene_name: str) -> bool:
@@ -118,17 +181,94 @@ class OBSControl:
             scene_name: Name of the scene to switch to
         """
         if not self.ws:
-            self.logger.error("Not connected to OBS")
+            log.error("Not connected to OBS")
             return False
         
         try:
             self.ws.call(requests.SetCurrentProgramScene(sceneName=scene_name))
-            self.logger.info(f"Switched to scene: {scene_name}")
+            log.info("Switched to scene: %s", scene_name)
             return True
         except Exception as e:
-            self.logger.error(f"Failed to switch scene: {e}")
+            log.error("Failed to switch scene: %s", e)
             return False
     
+    def batch(self, *reqs) -> list:
+        """Send several OBS requests in one round trip where possible
+
+        A composite flow like "switch scene, start recording, start
+        streaming" costs one WebSocket round trip per call when issued
+        individually. When the client library exposes the protocol's
+        RequestBatch op, all requests go out as a single frame
+        (SerialRealtime execution) and the parallel list of results
+        comes back; otherwise the requests run serially over the one
+        persistent connection, with None marking a failed entry.
+        """
+        if not self.ws:
+            log.error("Not connected to OBS")
+            return []
+
+        batch_cls = getattr(requests, 'RequestBatch', None)
+        if batch_cls is not None:
+            try:
+                response = self.ws.call(batch_cls(
+                    requests=[r.data() for r in reqs],
+                    executionType=0
+                ))
+                return response.getResults()
+            except Exception as e:
+                log.warning("Request batch failed, falling back to serial: %s", e)
+
+        results = []
+        for req in reqs:
+            try:
+                results.append(self.ws.call(req))
+            except Exception as e:
+                log.error("Batched request failed: %s", e)
+                results.append(None)
+        return results
+
+    async def _in_worker(self, fn, *args):
+        """Run a blocking OBS call on the instance's worker thread
+
+        ws.call blocks for the full WebSocket round trip, which stalls
+        an asyncio event loop orchestrating a live event. The wrappers
+        below push the call onto a single worker thread instead —
+        exactly one, because obs-websocket-py is not thread-safe on a
+        shared ws object, so serializing through one thread is both
+        safe and cheaper than spawning a thread per call.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(*args))
+
+    async def connect_async(self, retries: int = 6, base: float = 0.5) -> bool:
+        return await self._in_worker(self.connect, retries, base)
+
+    async def disconnect_async(self):
+        return await self._in_worker(self.disconnect)
+
+    async def start_recording_async(self) -> bool:
+        return await self._in_worker(self.start_recording)
+
+    async def stop_recording_async(self) -> bool:
+        return await self._in_worker(self.stop_recording)
+
+    async def start_streaming_async(self) -> bool:
+        return await self._in_worker(self.start_streaming)
+
+    async def stop_streaming_async(self) -> bool:
+        return await self._in_worker(self.stop_streaming)
+
+    async def set_scene_async(self, scene_name: str) -> bool:
+        return await self._in_worker(self.set_scene, scene_name)
+
+    async def batch_async(self, *reqs) -> list:
+        return await self._in_worker(self.batch, *reqs)
+
+    async def get_recording_status_async(self) -> dict:
+        return await self._in_worker(self.get_recording_status)
+
     def get_recording_status(self) -> dict:
         """Get current recording status"""
         if not self.ws:
@@ -141,29 +281,146 @@ class OBSControl:
                 "recording_paused": response.getOutputPaused() if hasattr(response, 'getOutputPaused') else False
             }
         except Exception as e:
-            self.logger.error(f"Failed to get recording status: {e}")
+            log.error("Failed to get recording status: %s", e)
             return {"error": str(e)}
 
 
+class OBSControlDaemon:
+    """Long-lived OBS control process behind a Unix socket
+
+    Every CLI invocation used to pay the full TCP + WebSocket Identify
+    handshake for a single command. The daemon connects to OBS once and
+    dispatches newline-delimited JSON verbs like
+    {"cmd": "set_scene", "scene": "Main"} received over DEFAULT_SOCKET,
+    so a command costs one local round trip instead.
+    """
+
+    def __init__(self, obs: "OBSControl", socket_path: str = DEFAULT_SOCKET):
+        self.obs = obs
+        self.socket_path = socket_path
+
+    def _dispatch(self, request: dict) -> dict:
+        """Run one verb against the shared OBS connection"""
+        cmd = request.get("cmd")
+        if cmd == "start_recording":
+            return {"ok": self.obs.start_recording()}
+        if cmd == "stop_recording":
+            return {"ok": self.obs.stop_recording()}
+        if cmd == "start_streaming":
+            return {"ok": self.obs.start_streaming()}
+        if cmd == "stop_streaming":
+            return {"ok": self.obs.stop_streaming()}
+        if cmd == "set_scene":
+            return {"ok": self.obs.set_scene(request.get("scene", ""))}
+        if cmd == "status":
+            return {"ok": True, "status": self.obs.get_recording_status()}
+        return {"ok": False, "error": f"Unknown command: {cmd}"}
+
+    def run(self):
+        """Serve verbs until SIGTERM/SIGINT; disconnects OBS on exit"""
+        if not self.obs.connect():
+            raise RuntimeError("Failed to connect to OBS")
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        reply = daemon._dispatch(json.loads(line))
+                    except (ValueError, KeyError) as e:
+                        reply = {"ok": False, "error": str(e)}
+                    self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+        server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda *_: server.shutdown())
+
+        log.info("OBS control daemon listening on %s", self.socket_path)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+            self.obs.disconnect()
+
+
+def send_command(request: dict, socket_path: str = DEFAULT_SOCKET) -> Optional[dict]:
+    """Send one verb to a running daemon; None when no daemon is up"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(10)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            reply = b""
+            while not reply.endswith(b"\n"):
+                chunk = sock.recv(4096)
+                if not chunk:
+                    break
+                reply += chunk
+        return json.loads(reply) if reply else None
+    except (OSError, ValueError):
+        return None
+
+
 def main():
     """CLI entry point for testing"""
     import argparse
-    
+
     parser = argparse.ArgumentParser(description='OBS WebSocket Control')
-    parser.add_argument('command', choices=['start-recording', 'stop-recording', 'start-streaming', 'stop-streaming', 'scene', 'status'])
+    parser.add_argument('command', choices=['start-recording', 'stop-recording', 'start-streaming', 'stop-streaming', 'scene', 'status', 'daemon'])
     parser.add_argument('--host', default='localhost', help='OBS host')
     parser.add_argument('--port', type=int, default=4455, help='OBS WebSocket port')
     parser.add_argument('--password', default='', help='WebSocket password')
     parser.add_argument('--scene', help='Scene name (for scene command)')
-    
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help='Control daemon socket path')
+
     args = parser.parse_args()
-    
+
+    if args.command == 'daemon':
+        OBSControlDaemon(
+            OBSControl(args.host, args.port, args.password),
+            socket_path=args.socket
+        ).run()
+        return
+
+    # Prefer a running daemon (one warm OBS connection); fall back to a
+    # direct connect when none is listening
+    verb = {
+        'start-recording': {"cmd": "start_recording"},
+        'stop-recording': {"cmd": "stop_recording"},
+        'start-streaming': {"cmd": "start_streaming"},
+        'stop-streaming': {"cmd": "stop_streaming"},
+        'scene': {"cmd": "set_scene", "scene": args.scene or ""},
+        'status': {"cmd": "status"},
+    }[args.command]
+
+    if args.command == 'scene' and not args.scene:
+        print("Error: --scene required")
+        return
+
+    reply = send_command(verb, socket_path=args.socket)
+    if reply is not None:
+        if args.command == 'status':
+            print(f"Recording status: {reply.get('status')}")
+        elif not reply.get("ok"):
+            print(f"Command failed: {reply.get('error', 'unknown error')}")
+        return
+
     obs = OBSControl(args.host, args.port, args.password)
-    
+
     if not obs.connect():
         print("Failed to connect to OBS")
         return
-    
+
     try:
         if args.command == 'start-recording':
             obs.start_recording()
@@ -174,10 +431,7 @@ def main():
         elif args.command == 'stop-streaming':
             obs.stop_streaming()
         elif args.command == 'scene':
-            if not args.scene:
-                print("Error: --scene required")
-            else:
-                obs.set_scene(args.scene)
+            obs.set_scene(args.scene)
         elif args.command == 'status':
             status = obs.get_recording_status()
             print(f"Recording status: {status}")
@@ -2,12 +2,128 @@
 Website Publisher - Generate markdown and push to git repository
 """
 
+import atexit
+import json
 import logging
+import os
+import queue
+import re
+import shutil
 import subprocess
+import threading
+import time
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, NamedTuple
 from datetime import datetime
 
+# Module-level logger; %s-style arguments defer formatting until the
+# record is actually emitted
+log = logging.getLogger(__name__)
+
+# Slug character classes, compiled once: strip anything that is not a
+# word character, space or hyphen, then collapse runs of space/hyphen.
+# re runs in C over the whole string instead of per-char Python calls.
+_SLUG_STRIP_RE = re.compile(r'[^\w\s-]+')
+_SLUG_SEP_RE = re.compile(r'[\s_-]+')
+
+
+class _PushQueue:
+    """Coalesces git pushes from rapid successive publishes
+
+    Pushing inline blocked every publish() for the full network round
+    trip (seconds against GitHub), and publishing several sermons in a
+    row paid that per sermon. Pushes are instead enqueued; a worker
+    thread waits out a short debounce window, drains whatever else has
+    queued up, and runs one push per repository.
+    """
+
+    DEBOUNCE = 2.0
+
+    def __init__(self):
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def enqueue(self, repo_path: str) -> None:
+        # put and liveness check share the lock with the worker's exit
+        # path, so an item enqueued while the worker is deciding to stop
+        # is either seen by that worker or handled by a fresh one
+        with self._lock:
+            self._queue.put(str(repo_path))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            try:
+                repos = {self._queue.get(timeout=0.5)}
+            except queue.Empty:
+                # Re-check under the lock before exiting: without it, an
+                # enqueue racing this timeout could see is_alive() True,
+                # skip starting a replacement, and strand its item
+                with self._lock:
+                    try:
+                        repos = {self._queue.get_nowait()}
+                    except queue.Empty:
+                        self._thread = None
+                        return
+            time.sleep(self.DEBOUNCE)
+            while True:
+                try:
+                    repos.add(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._push_all(repos)
+
+    @staticmethod
+    def _push_all(repos) -> None:
+        for repo in repos:
+            try:
+                subprocess.run(['git', 'push'], cwd=repo, check=True)
+                log.info("Pushed to remote repository")
+            except subprocess.CalledProcessError as e:
+                log.error("Background push failed: %s", e)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Run the pending pushes to completion (for shutdown/tests)
+
+        Waits for the worker, then pushes anything still queued inline —
+        a bounded join can expire mid-debounce, and at interpreter exit
+        the daemon worker may already be gone.
+        """
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        repos = set()
+        while True:
+            try:
+                repos.add(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._push_all(repos)
+
+
+_push_queue = _PushQueue()
+
+# The worker is a daemon thread, so a short-lived process (the CLI, a
+# one-shot script) would otherwise exit mid-debounce and silently drop
+# the queued push; atexit runs before daemon threads are killed
+atexit.register(_push_queue.flush)
+
+
+class _PublishContext(NamedTuple):
+    """Paths derived once per publish() call
+
+    The date, slug and derived directories feed both the post filename
+    and the assets directory; computing them in one place means one
+    _slugify pass and one mkdir per publish instead of one per asset.
+    """
+    date: str
+    slug: str
+    post_path: Path
+    assets_dir: Path
+
 
 class WebsitePublisher:
     """Publishes sermon content to website via Git"""
@@ -22,15 +138,18 @@ class WebsitePublisher:
         """
         self.repo_path = Path(repo_path)
         self.content_dir = content_dir
-        self.logger = self._setup_logger()
-        
+
         if not self.repo_path.exists():
             raise ValueError(f"Repository path does not exist: {repo_path}")
-    
-    def _setup_logger(self) -> logging.Logger:
-        logger = logging.getLogger("WebsitePublisher")
-        logger.setLevel(logging.INFO)
-        return logger
+
+        # In-process libgit2 commits skip the fork+exec plus git's own
+        # startup (config load, repo discovery, index refresh) per
+        # publish; the subprocess path remains the fallback
+        try:
+            import pygit2
+            self._repo = pygit2.Repository(str(self.repo_path))
+        except Exception:
+            self._repo = None
     
     def publish(
         self,
@@ -56,170 +175,257 @@ class WebsitePublisher:
             (success, error_message, post_path)
         """
         try:
-            self.logger.info(f"Publishing: {event_data.get('title')}")
-            
-            # Generate markdown content
-            markdown = self._generate_markdown(event_data, video_url)
-            
-            # Create post file
-            post_path = self._save_post(event_data, markdown)
-            
-            # Copy assets (thumbnail, captions)
+            log.info("Publishing: %s", event_data.get('title'))
+
+            # Derive date/slug/paths once; _save_post and the asset
+            # copy reuse them instead of recomputing per file
+            ctx = self._publish_context(event_data)
+
+            # Create post file (markdown streams straight to disk)
+            post_path = self._save_post(event_data, video_url, ctx)
+
+            # Copy assets (thumbnail, captions) in one pass: the
+            # destination directory is created once and each file takes
+            # the kernel-side copy path
+            assets = []
             if thumbnail_path:
-                self._copy_asset(thumbnail_path, event_data)
-            
+                assets.append(thumbnail_path)
             if captions:
-                for fmt, path in captions.items():
-                    self._copy_asset(path, event_data)
+                assets.extend(captions.values())
+            if assets:
+                self._copy_assets_bulk(assets, event_data, ctx)
             
-            # Git operations
+            # Git operations. The push runs on the background queue so
+            # publish() returns once the commit lands; back-to-back
+            # publishes coalesce into a single push.
             if auto_commit:
                 self._git_add_commit(event_data)
-                
+
                 if auto_push:
-                    self._git_push()
+                    _push_queue.enqueue(self.repo_path)
             
-            self.logger.info(f"Published successfully: {post_path}")
+            log.info("Published successfully: %s", post_path)
             return True, None, str(post_path)
         
         except Exception as e:
-            self.logger.error(f"Publishing failed: {e}")
+            log.error("Publishing failed: %s", e)
             return False, str(e), None
     
-    def _generate_markdown(self, event_data: Dict, video_url: Optional[str]) -> str:
-        """Generate markdown content for sermon post"""
+    def _iter_markdown(self, event_data: Dict, video_url: Optional[str]):
+        """Yield the sermon post line by line
+
+        _save_post hands this straight to writelines, so the post never
+        exists as an intermediate list plus a joined copy in memory.
+        """
         title = event_data.get('title', 'Untitled')
         speaker = event_data.get('speaker', '')
         scripture = event_data.get('scripture', '')
         series = event_data.get('series', '')
         date = event_data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        
-        # Front matter (YAML)
-        front_matter = [
-            "---",
-            f"title: \"{title}\"",
-            f"date: {date}",
-            f"speaker: \"{speaker}\""
-        ]
-        
+
+        # Front matter (YAML). Values are emitted through json.dumps:
+        # a JSON string is a valid YAML double-quoted scalar, and this
+        # C-level escape handles titles containing quotes, colons or
+        # backslashes that a bare f-string would corrupt.
+        yield "---\n"
+        yield f"title: {json.dumps(title, ensure_ascii=False)}\n"
+        yield f"date: {date}\n"
+        yield f"speaker: {json.dumps(speaker, ensure_ascii=False)}\n"
+
         if series:
-            front_matter.append(f"series: \"{series}\"")
-        
+            yield f"series: {json.dumps(series, ensure_ascii=False)}\n"
+
         if scripture:
-            front_matter.append(f"scripture: \"{scripture}\"")
-        
+            yield f"scripture: {json.dumps(scripture, ensure_ascii=False)}\n"
+
         if video_url:
-            front_matter.append(f"video_url: \"{video_url}\"")
-        
-        front_matter.extend([
-            "draft: false",
-            "---",
-            ""
-        ])
-        
+            yield f"video_url: {json.dumps(video_url, ensure_ascii=False)}\n"
+
+        yield "draft: false\n"
+        yield "---\n"
+        yield "\n"
+
         # Content
-        content = []
-        
         if series:
-            content.append(f"**Series:** {series}\n")
-        
+            yield f"**Series:** {series}\n\n"
+
         if scripture:
-            content.append(f"**Scripture:** {scripture}\n")
-        
+            yield f"**Scripture:** {scripture}\n\n"
+
         if speaker:
-            content.append(f"**Speaker:** {speaker}\n")
-        
-        content.append("")
-        
+            yield f"**Speaker:** {speaker}\n\n"
+
+        yield "\n"
+
         if video_url:
-            content.append("## Watch")
-            content.append("")
-            content.append(f"[Watch on YouTube]({video_url})")
-            content.append("")
-        
-        content.append("## About This Message")
-        content.append("")
-        content.append("_Message description coming soon._")
-        content.append("")
-        
-        return "\n".join(front_matter + content)
-    
-    def _save_post(self, event_data: Dict, markdown: str) -> Path:
-        """Save markdown post to file"""
-        # Create filename from event data
+            yield "## Watch\n"
+            yield "\n"
+            yield f"[Watch on YouTube]({video_url})\n"
+            yield "\n"
+
+        yield "## About This Message\n"
+        yield "\n"
+        yield "_Message description coming soon._\n"
+
+    def _generate_markdown(self, event_data: Dict, video_url: Optional[str]) -> str:
+        """Generate markdown content for sermon post as one string"""
+        return ''.join(self._iter_markdown(event_data, video_url))
+
+    def _publish_context(self, event_data: Dict) -> _PublishContext:
+        """Compute the per-publish date, slug and destination paths"""
         date = event_data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        title_slug = self._slugify(event_data.get('title', 'untitled'))
-        filename = f"{date}-{title_slug}.md"
-        
-        # Full path
-        content_path = self.repo_path / self.content_dir
-        content_path.mkdir(parents=True, exist_ok=True)
-        
-        post_path = content_path / filename
-        
+        slug = self._slugify(event_data.get('title', 'untitled'))
+        return _PublishContext(
+            date=date,
+            slug=slug,
+            post_path=self.repo_path / self.content_dir / f"{date}-{slug}.md",
+            assets_dir=self.repo_path / "static" / "sermons" / f"{date}-{slug}"
+        )
+
+    def _save_post(
+        self,
+        event_data: Dict,
+        video_url: Optional[str],
+        ctx: Optional[_PublishContext] = None
+    ) -> Path:
+        """Stream the markdown post to file"""
+        if ctx is None:
+            ctx = self._publish_context(event_data)
+
+        ctx.post_path.parent.mkdir(parents=True, exist_ok=True)
+
         # Write file
-        with open(post_path, 'w', encoding='utf-8') as f:
-            f.write(markdown)
-        
-        return post_path
+        with open(ctx.post_path, 'w', encoding='utf-8', buffering=65536) as f:
+            f.writelines(self._iter_markdown(event_data, video_url))
+
+        return ctx.post_path
     
     def _copy_asset(self, source_path: str, event_data: Dict):
-        """Copy asset (thumbnail, caption) to website repo"""
-        import shutil
-        
-        source = Path(source_path)
-        if not source.exists():
-            self.logger.warning(f"Asset not found: {source_path}")
-            return
-        
-        # Determine destination
-        date = event_data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        title_slug = self._slugify(event_data.get('title', 'untitled'))
-        
-        assets_dir = self.repo_path / "static" / "sermons" / f"{date}-{title_slug}"
+        """Copy a single asset (thumbnail, caption) to the website repo"""
+        self._copy_assets_bulk([source_path], event_data)
+
+    def _copy_assets_bulk(
+        self,
+        source_paths,
+        event_data: Dict,
+        ctx: Optional[_PublishContext] = None
+    ):
+        """Copy a batch of assets with one mkdir and kernel-side copies
+
+        The per-asset helper re-derived the slug and re-created the
+        destination directory for every file; here the directory comes
+        precomputed from the publish context and each file goes through
+        sendfile, so thumbnail and caption bytes never pass through
+        userspace.
+        """
+        if ctx is None:
+            ctx = self._publish_context(event_data)
+
+        assets_dir = ctx.assets_dir
         assets_dir.mkdir(parents=True, exist_ok=True)
-        
-        dest = assets_dir / source.name
-        shutil.copy2(source, dest)
-        
-        self.logger.info(f"Copied asset: {source.name}")
+
+        for source_path in source_paths:
+            source = Path(source_path)
+            if not source.exists():
+                log.warning("Asset not found: %s", source_path)
+                continue
+            if self._copy_file(source, assets_dir / source.name):
+                log.info("Copied asset: %s", source.name)
+
+    @staticmethod
+    def _copy_file(source: Path, dest: Path) -> bool:
+        """Copy file data via sendfile, then carry over the timestamps
+
+        Re-running publish() after a markdown fix re-copies assets that
+        never changed, so a destination matching the source's size and
+        mtime is skipped — the copy below propagates mtime_ns exactly,
+        making the comparison reliable. Returns False on skip.
+
+        Hugo only cares about content and mtime, so os.utime replaces
+        the full copystat (permission bits, xattrs, flags).
+        """
+        st = os.stat(source)
+        try:
+            dst_st = os.stat(dest)
+            if st.st_size == dst_st.st_size and st.st_mtime_ns == dst_st.st_mtime_ns:
+                log.debug("Asset up-to-date, skipping: %s", source.name)
+                return False
+        except OSError:
+            pass
+        with open(source, 'rb') as fsrc, open(dest, 'wb') as fdst:
+            size = os.fstat(fsrc.fileno()).st_size
+            copied = 0
+            try:
+                while copied < size:
+                    sent = os.sendfile(fdst.fileno(), fsrc.fileno(), copied, size - copied)
+                    if sent == 0:
+                        break
+                    copied += sent
+            except (AttributeError, OSError):
+                fsrc.seek(copied)
+                fdst.seek(copied)
+                shutil.copyfileobj(fsrc, fdst)
+        os.utime(dest, ns=(st.st_atime_ns, st.st_mtime_ns))
+        return True
     
     def _git_add_commit(self, event_data: Dict):
         """Add and commit changes"""
         title = event_data.get('title', 'Untitled')
-        
+        commit_message = f"Add sermon: {title}"
+
+        if self._repo is not None:
+            try:
+                self._commit_in_process(commit_message)
+                log.info("Committed changes: %s", commit_message)
+                return
+            except Exception as e:
+                log.warning("pygit2 commit failed, falling back to git: %s", e)
+
         # Git add
         subprocess.run(
             ['git', 'add', '.'],
             cwd=self.repo_path,
             check=True
         )
-        
+
         # Git commit
-        commit_message = f"Add sermon: {title}"
         subprocess.run(
             ['git', 'commit', '-m', commit_message],
             cwd=self.repo_path,
             check=True
         )
-        
-        self.logger.info(f"Committed changes: {commit_message}")
+
+        log.info("Committed changes: %s", commit_message)
+
+    def _commit_in_process(self, message: str):
+        """Stage everything and commit via libgit2, no subprocess"""
+        repo = self._repo
+        index = repo.index
+        index.add_all()
+        index.write()
+        tree = index.write_tree()
+        signature = repo.default_signature
+        parents = [] if repo.head_is_unborn else [repo.head.target]
+        repo.create_commit('HEAD', signature, signature, message, tree, parents)
     
     def _git_push(self):
-        """Push changes to remote"""
+        """Push changes to remote immediately (bypasses the queue)"""
         subprocess.run(
             ['git', 'push'],
             cwd=self.repo_path,
             check=True
         )
-        
-        self.logger.info("Pushed to remote repository")
+
+        log.info("Pushed to remote repository")
+
+    def wait_for_push(self, timeout: Optional[float] = None):
+        """Block until queued background pushes complete"""
+        _push_queue.flush(timeout)
     
     def _slugify(self, text: str) -> str:
         """Convert text to URL-safe slug"""
-        text = text.lower()
-        text = ''.join(c if c.isalnum() or c in ' -_' else '' for c in text)
-        text = '-'.join(text.split())
+        text = _SLUG_STRIP_RE.sub('', text.lower())
+        text = _SLUG_SEP_RE.sub('-', text).strip('-')
         return text[:50]
 
 
@@ -252,6 +458,10 @@ def main():
     )
     
     if success:
+        if args.push:
+            # The push is debounced onto a background thread; wait for
+            # it so the success message means the remote has the post
+            publisher.wait_for_push()
         print(f"✓ Published: {post_path}")
     else:
         print(f"✗ Failed: {error}")
@@ -3,10 +3,16 @@ YouTube Uploader - Upload video, thumbnail, and captions
 """
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict
 import os
 
+# Module-level logger; %s-style arguments defer formatting until the
+# record is actually emitted
+log = logging.getLogger(__name__)
+
 
 class YouTubeUploader:
     """Uploads videos to YouTube with metadata"""
@@ -19,7 +25,13 @@ class YouTubeUploader:
             credentials_path: Path to OAuth2 credentials file
         """
         self.credentials_path = credentials_path
-        self.logger = self._setup_logger()
+        self._creds = None
+        self._service = None
+        self._http_local = threading.local()
+        # Optional progress hook: called with the integer percentage
+        # once per percent during video upload; when set, replaces the
+        # progress log lines (UIs poll this, batch runs stay quiet)
+        self.on_progress: Optional[Callable[[int], None]] = None
         
         # Check if google-api-python-client is available
         try:
@@ -28,17 +40,12 @@ class YouTubeUploader:
             from google.auth.transport.requests import Request
             self.available = True
         except ImportError:
-            self.logger.warning(
+            log.warning(
                 "YouTube API libraries not installed. "
                 "Install with: pip install google-api-python-client google-auth-oauthlib"
             )
             self.available = False
     
-    def _setup_logger(self) -> logging.Logger:
-        logger = logging.getLogger("YouTubeUploader")
-        logger.setLevel(logging.INFO)
-        return logger
-    
     def upload(
         self,
         video_path: str,
@@ -71,9 +78,26 @@ class YouTubeUploader:
         if not self.available:
             return False, "YouTube API libraries not installed", None
         
-        self.logger.info(f"Uploading video: {title}")
+        log.info("Uploading video: %s", title)
         
         try:
+            # Validate side-call inputs up front: an unsupported caption
+            # format fails here instead of after the multi-GB video
+            # upload, and the format/existence checks run once rather
+            # than inside each API call
+            if thumbnail_path and not os.path.isfile(thumbnail_path):
+                log.warning("Thumbnail not found, skipping: %s", thumbnail_path)
+                thumbnail_path = None
+
+            caption_jobs = []
+            for caption_path in captions or []:
+                if not os.path.isfile(caption_path):
+                    log.warning("Caption not found, skipping: %s", caption_path)
+                    continue
+                caption_jobs.append(
+                    (os.fspath(caption_path), self._detect_caption_format(caption_path))
+                )
+
             # Get authenticated service
             youtube = self._get_authenticated_service()
             
@@ -91,35 +115,75 @@ class YouTubeUploader:
             if not video_id:
                 return False, "Video upload failed", None
             
-            # Set thumbnail
-            if thumbnail_path and Path(thumbnail_path).exists():
-                self._set_thumbnail(youtube, video_id, thumbnail_path)
-            
-            # Upload captions
-            if captions:
-                for caption_path in captions:
-                    if Path(caption_path).exists():
-                        self._upload_caption(youtube, video_id, caption_path)
-            
-            # Add to playlist
+            # Post-upload side calls (thumbnail, captions, playlist)
+            # are independent round trips to googleapis.com; run them
+            # concurrently so the tail costs the slowest call rather
+            # than the sum of all of them
+            tasks = []
+            if thumbnail_path:
+                tasks.append((self._set_thumbnail, (youtube, video_id, thumbnail_path)))
+            for caption_path, caption_format in caption_jobs:
+                tasks.append((self._upload_caption, (youtube, video_id, caption_path, caption_format)))
             if playlist_id:
-                self._add_to_playlist(youtube, video_id, playlist_id)
+                tasks.append((self._add_to_playlist, (youtube, video_id, playlist_id)))
+
+            if len(tasks) > 1:
+                with ThreadPoolExecutor(max_workers=min(4, len(tasks))) as pool:
+                    futures = [
+                        pool.submit(self._run_side_call, fn, fn_args)
+                        for fn, fn_args in tasks
+                    ]
+                    for future in futures:
+                        future.result()
+            elif tasks:
+                fn, fn_args = tasks[0]
+                self._run_side_call(fn, fn_args)
             
             video_url = f"https://www.youtube.com/watch?v={video_id}"
-            self.logger.info(f"Upload successful: {video_url}")
+            log.info("Upload successful: %s", video_url)
             
             return True, None, video_url
         
         except Exception as e:
-            self.logger.error(f"Upload failed: {e}")
+            log.error("Upload failed: %s", e)
             return False, str(e), None
     
+    # Refresh credentials this long before actual expiry, so a token
+    # never dies mid-batch between the check and the API call
+    REFRESH_MARGIN = 300.0
+
+    @classmethod
+    def _expiring_soon(cls, creds) -> bool:
+        from datetime import datetime
+        expiry = getattr(creds, 'expiry', None)
+        if expiry is None:
+            return False
+        return (expiry - datetime.utcnow()).total_seconds() < cls.REFRESH_MARGIN
+
     def _get_authenticated_service(self):
-        """Authenticate and return YouTube service"""
+        """Authenticate and return YouTube service
+
+        The built service is cached on the instance: rebuilding per
+        upload re-read the token pickle, re-ran an OAuth refresh round
+        trip, and re-fetched the ~1 MB discovery document. A batch of
+        uploads now pays authentication once, with a proactive refresh
+        when the token is within REFRESH_MARGIN of expiring.
+        """
         from googleapiclient.discovery import build
         from google_auth_oauthlib.flow import InstalledAppFlow
         from google.auth.transport.requests import Request
         import pickle
+
+        if self._service is not None and self._creds is not None:
+            if self._creds.valid and not self._expiring_soon(self._creds):
+                return self._service
+            if self._creds.refresh_token:
+                try:
+                    self._creds.refresh(Request())
+                    return self._service
+                except Exception as e:
+                    log.warning("Token refresh failed, re-authenticating: %s", e)
+            self._service = None
         
         SCOPES = ['https://www.googleapis.com/auth/youtube.upload']
         
@@ -145,7 +209,47 @@ class YouTubeUploader:
             with open(token_path, 'wb') as token:
                 pickle.dump(creds, token)
         
-        return build('youtube', 'v3', credentials=creds)
+        self._creds = creds
+        # Skip the discovery-document fetch where the client ships the
+        # static document; older releases fall back to fetching it once
+        try:
+            self._service = build(
+                'youtube', 'v3', credentials=creds,
+                cache_discovery=False, static_discovery=True
+            )
+        except TypeError:
+            self._service = build('youtube', 'v3', credentials=creds, cache_discovery=False)
+        return self._service
+
+    def _run_side_call(self, fn, fn_args):
+        """Execute one side call over the calling thread's HTTP object"""
+        fn(*fn_args, http=self._authorized_http())
+
+    def _authorized_http(self):
+        """Authorized HTTP object, cached per thread
+
+        httplib2 keeps the TCP+TLS connection to googleapis.com open
+        between requests, so reusing one object per thread amortizes
+        the handshake across every side call that thread makes over the
+        uploader's lifetime. Cached per thread rather than per instance
+        because httplib2 is not thread-safe; invalidated when the
+        credentials object is replaced by a re-auth. Returns None
+        (library default transport) when the helper libraries are
+        absent.
+        """
+        try:
+            import httplib2
+            import google_auth_httplib2
+        except ImportError:
+            return None
+        if self._creds is None:
+            return None
+        if getattr(self._http_local, 'creds', None) is self._creds:
+            return self._http_local.http
+        http = google_auth_httplib2.AuthorizedHttp(self._creds, http=httplib2.Http(timeout=60))
+        self._http_local.http = http
+        self._http_local.creds = self._creds
+        return http
     
     def _upload_video(
         self,
@@ -172,9 +276,14 @@ class YouTubeUploader:
             }
         }
         
+        # 16 MiB chunks: each chunk costs a full HTTP round trip before
+        # the next may start (the resumable protocol is strictly
+        # serial), so a 2 GB sermon at 1 MB chunks paid ~2000 RTTs of
+        # pure latency. Larger chunks keep the TCP window open and cut
+        # the request count 16x.
         media = MediaFileUpload(
             video_path,
-            chunksize=1024*1024,  # 1MB chunks
+            chunksize=16 * 1024 * 1024,
             resumable=True
         )
         
@@ -184,15 +293,25 @@ class YouTubeUploader:
             media_body=media
         )
         
+        # One progress report per percent: next_chunk fires per chunk,
+        # and a long upload would otherwise format and lock a log line
+        # for every chunk that lands on the same percentage
         response = None
+        last_pct = -1
         while response is None:
             status, response = request.next_chunk()
             if status:
-                self.logger.info(f"Upload progress: {int(status.progress() * 100)}%")
-        
+                pct = int(status.progress() * 100)
+                if pct != last_pct:
+                    last_pct = pct
+                    if self.on_progress is not None:
+                        self.on_progress(pct)
+                    elif log.isEnabledFor(logging.INFO):
+                        log.info("Upload progress: %d%%", pct)
+
         return response['id']
     
-    def _set_thumbnail(self, youtube, video_id: str, thumbnail_path: str):
+    def _set_thumbnail(self, youtube, video_id: str, thumbnail_path: str, http=None):
         """Set video thumbnail"""
         from googleapiclient.http import MediaFileUpload
         
@@ -200,24 +319,28 @@ class YouTubeUploader:
         youtube.thumbnails().set(
             videoId=video_id,
             media_body=media
-        ).execute()
+        ).execute(http=http)
         
-        self.logger.info(f"Thumbnail set for video {video_id}")
+        log.info("Thumbnail set for video %s", video_id)
     
-    def _upload_caption(self, youtube, video_id: str, caption_path: str):
+    @staticmethod
+    def _detect_caption_format(caption_path: str) -> str:
+        """Map a caption file extension to the API format name
+
+        Raises ValueError on unsupported extensions so a bad caption
+        list fails upload() before any bytes are sent.
+        """
+        ext = os.path.splitext(caption_path)[1].lower()
+        if ext == '.srt':
+            return 'srt'
+        if ext == '.vtt':
+            return 'webvtt'
+        raise ValueError(f"Unsupported caption format: {ext}")
+
+    def _upload_caption(self, youtube, video_id: str, caption_path: str, caption_format: str, http=None):
         """Upload caption file"""
         from googleapiclient.http import MediaFileUpload
-        
-        # Detect caption format
-        ext = Path(caption_path).suffix.lower()
-        if ext == '.srt':
-            caption_format = 'srt'
-        elif ext == '.vtt':
-            caption_format = 'webvtt'
-        else:
-            self.logger.warning(f"Unsupported caption format: {ext}")
-            return
-        
+
         body = {
             'snippet': {
                 'videoId': video_id,
@@ -233,11 +356,11 @@ class YouTubeUploader:
             body=body,
             media_body=media,
             sync=True
-        ).execute()
+        ).execute(http=http)
         
-        self.logger.info(f"Caption uploaded for video {video_id}")
+        log.info("Caption uploaded for video %s", video_id)
     
-    def _add_to_playlist(self, youtube, video_id: str, playlist_id: str):
+    def _add_to_playlist(self, youtube, video_id: str, playlist_id: str, http=None):
         """Add video to playlist"""
         body = {
             'snippet': {
@@ -252,9 +375,9 @@ class YouTubeUploader:
         youtube.playlistItems().insert(
             part='snippet',
             body=body
-        ).execute()
+        ).execute(http=http)
         
-        self.logger.info(f"Added video {video_id} to playlist {playlist_id}")
+        log.info("Added video %s to playlist %s", video_id, playlist_id)
 
 
 def main():
@@ -3,13 +3,29 @@ Subtitle Engine - whisper.cpp implementation (Primary engine)
 Updated to be the default subtitle generation engine
 """
 
+import asyncio
+import atexit
+import hashlib
+import json
+import shutil
+import socket
 import subprocess
+import threading
+import time
 import logging
 import yaml
 import os
+from collections import deque
 from pathlib import Path
 from typing import Optional, List, Dict
 
+# libyaml-backed loader parses ~10x faster than the pure-Python one;
+# not every PyYAML install ships the C extension, so fall back quietly
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 class WhisperCppEngine:
     """Subtitle generation using whisper.cpp (default engine)"""
@@ -21,27 +37,76 @@ class WhisperCppEngine:
         'medium': 'ggml-medium.bin',
         'large': 'ggml-large-v3.bin'
     }
-    
-    def __init__(self, model: str = "base", models_dir: str = "models", whisper_bin: str = "whisper", config_path: str = "config/config.yaml"):
+
+    # Probe results shared across instances. Pipelines and workers
+    # construct an engine per job, and each construction paid a
+    # subprocess spawn (availability) and a YAML parse (config); both
+    # are keyed by (path, mtime) so a binary upgrade or config edit
+    # invalidates the cached answer.
+    _AVAIL_CACHE: Dict[tuple, bool] = {}
+    _CONFIG_CACHE: Dict[tuple, Dict] = {}
+    _BINARY_CACHE: Dict[str, str] = {}
+
+    # Accelerator builds of whisper.cpp, preferred over the plain CPU
+    # binary when installed: the encoder matmuls move to the GPU/ANE
+    # and transcription wallclock typically halves or better
+    _ACCEL_BINARIES = ("whisper-cuda", "whisper-metal", "whisper-coreml")
+
+    # ffmpeg input flags for low_latency mode: skip the probe/analyze
+    # buffering that delays the first decoded sample by seconds.
+    # -probesize 32 is the lossless part; nobuffer may clip leading ms.
+    _LOW_LATENCY_FLAGS = [
+        "-fflags", "nobuffer",
+        "-flags", "low_delay",
+        "-probesize", "32",
+        "-analyzeduration", "0"
+    ]
+
+
+    def __init__(self, model: str = "base", models_dir: str = "models", whisper_bin: str = "whisper", config_path: str = "config/config.yaml", low_latency: bool = False, cache_dir: str = "events/.subtitle_cache", threads: Optional[int] = None, vad_model: Optional[str] = None, use_server: bool = True):
         """
         Initialize whisper.cpp engine
-        
+
         Args:
             model: Model size (tiny, base, small, medium, large)
             models_dir: Directory containing GGML models
             whisper_bin: Path to whisper.cpp executable
             config_path: Path to configuration file
+            low_latency: Skip ffmpeg's probe/analyze buffering when
+                extracting audio. Saves ~1-3s of startup per clip on
+                live/partial recordings, but may clip leading
+                milliseconds, so it is opt-in.
+            cache_dir: Directory for cached subtitle outputs, keyed by
+                audio fingerprint
+            threads: whisper.cpp thread count; defaults to the CPUs
+                this process may run on, capped at 8 (whisper.cpp
+                scales poorly past that)
+            vad_model: Path to a silero VAD model (GGML). When set,
+                whisper.cpp skips silence and music instead of
+                decoding them — sermons with long musical intros and
+                outros spend most of their runtime there
+            use_server: Prefer a long-lived whisper-server process
+                (started lazily, when the binary is on PATH) that
+                keeps the model loaded between transcriptions
         """
         self.model_name = model
         self.models_dir = Path(models_dir)
+        self.low_latency = low_latency
+        self.cache_dir = Path(cache_dir)
+        self.n_threads = threads if threads else self._default_threads()
+        self.use_server = use_server
+        self._server_url: Optional[str] = None
+        self._server_proc: Optional[subprocess.Popen] = None
+        self._server_failed = False
         self.logger = self._setup_logger()
         
         # Load config
         config_data = self._load_config(config_path)
         
-        # Load custom whisper binary path from config if available
+        # Load custom whisper binary path from config if available;
+        # otherwise prefer an accelerator build found on PATH
         custom_bin = config_data.get('whisper_bin')
-        self.whisper_bin = custom_bin if custom_bin else whisper_bin
+        self.whisper_bin = custom_bin if custom_bin else self._resolve_binary(whisper_bin)
         
         # Load custom model path from config if available
         custom_model = config_data.get('model_path')
@@ -55,7 +120,18 @@ class WhisperCppEngine:
             # Build model path from models_dir + model name
             model_file = self.SUPPORTED_MODELS.get(model, self.SUPPORTED_MODELS['base'])
             self.model_path = self.models_dir / model_file
-        
+
+        # Absolute path string resolved once; every transcription
+        # command re-ran Path.absolute() + str() for the same value
+        self.model_path_str = str(self.model_path.absolute())
+
+        # VAD model: ctor argument wins, then config
+        vad_path = vad_model or config_data.get('vad_model')
+        if vad_path and not os.path.isfile(vad_path):
+            self.logger.warning(f"VAD model not found, disabling VAD: {vad_path}")
+            vad_path = None
+        self.vad_model = vad_path
+
         # Check if whisper.cpp is available
         self.available = self._check_availability()
     
@@ -70,9 +146,14 @@ class WhisperCppEngine:
         try:
             if not os.path.exists(config_path):
                 return result
-            
+
+            cache_key = (config_path, os.path.getmtime(config_path))
+            cached = self._CONFIG_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+
             with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YamlLoader)
             
             whispercpp_config = config.get('modules', {}).get('subtitles', {}).get('whispercpp', {})
             
@@ -98,24 +179,84 @@ class WhisperCppEngine:
                     if model_path_obj.exists():
                         self.logger.info(f"Using model path: {model_path}")
                         result['model_path'] = model_path
-            
+
+            # Optional VAD model path
+            vad_model = whispercpp_config.get('vad_model')
+            if vad_model:
+                result['vad_model'] = vad_model
+
+            self._CONFIG_CACHE[cache_key] = result
+
         except Exception as e:
             self.logger.warning(f"Failed to load config: {e}")
-        
+
         return result
-    
-    def _check_availability(self) -> bool:
-        """Check if whisper.cpp is installed"""
+
+    def _resolve_binary(self, whisper_bin: str) -> str:
+        """Pick an accelerated whisper.cpp build when one is on PATH
+
+        Only applies to the default binary name: an explicit ctor or
+        config value is an operator decision and wins unchanged. The
+        lookup result is cached per requested name, matching the other
+        per-class probe caches.
+        """
+        if whisper_bin != "whisper":
+            return whisper_bin
+
+        cached = self._BINARY_CACHE.get(whisper_bin)
+        if cached is not None:
+            return cached
+
+        resolved = whisper_bin
+        for candidate in self._ACCEL_BINARIES:
+            found = shutil.which(candidate)
+            if found:
+                self.logger.info(f"Using accelerated whisper.cpp binary: {found}")
+                resolved = found
+                break
+
+        self._BINARY_CACHE[whisper_bin] = resolved
+        return resolved
+
+    def _check_availability(self, strict: bool = False) -> bool:
+        """Check if whisper.cpp is installed
+
+        PATH resolution plus an executable-bit check answers this in
+        microseconds. The old --help subprocess probe cost a fork+exec
+        per engine and is kept behind strict=True for callers that
+        want proof the binary actually runs.
+        """
         try:
-            result = subprocess.run(
-                [self.whisper_bin, '--help'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            return False
+            mtime = os.path.getmtime(self.whisper_bin)
+        except OSError:
+            # Bare command name resolved via PATH; still cacheable
+            mtime = None
+        cache_key = (self.whisper_bin, mtime, strict)
+        cached = self._AVAIL_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if strict:
+            try:
+                result = subprocess.run(
+                    [self.whisper_bin, '--help'],
+                    capture_output=True,
+                    text=True,
+                    timeout=5
+                )
+                available = result.returncode == 0
+            except (FileNotFoundError, subprocess.TimeoutExpired):
+                available = False
+        else:
+            resolved = shutil.which(self.whisper_bin)
+            if resolved is None and os.path.isfile(self.whisper_bin) and os.access(self.whisper_bin, os.X_OK):
+                resolved = self.whisper_bin
+            available = resolved is not None
+            if resolved:
+                self.whisper_bin = resolved
+
+        self._AVAIL_CACHE[cache_key] = available
+        return available
     
     def check_model(self) -> bool:
         """Check if model file exists"""
@@ -154,148 +295,961 @@ class WhisperCppEngine:
         
         if formats is None:
             formats = ["srt", "vtt", "txt"]
-        
+
+        # Always produce the JSON transcript alongside the requested
+        # formats: later runs asking for a format that was never
+        # generated re-render it from the cached JSON instead of
+        # re-transcribing
+        run_formats = formats if 'json' in formats else formats + ['json']
+
+        # Re-transcribing the same sermon (rebuilds, retries, extra
+        # format runs) re-ran whisper.cpp end to end; a fingerprint of
+        # the decoded audio turns the repeat into a file copy
+        cache_key = self._cache_key(
+            video_path, language, translate_to_english, max_length, split_on_word
+        )
+        if cache_key:
+            cached = self._cache_get(cache_key, formats, video_path, output_dir)
+            if cached is not None:
+                self.logger.info("Subtitle cache hit, skipping transcription")
+                return True, None, cached
+
+        # Prefer the resident server: the model stays loaded between
+        # transcriptions instead of being re-read from disk per run.
+        # Segmentation flags are not exposed by the server API, so
+        # those requests take the subprocess route.
+        if self.use_server and max_length == 0 and not split_on_word:
+            success, error, output = self._transcribe_server(
+                video_path, output_dir, language, formats, translate_to_english
+            )
+            if success:
+                if cache_key:
+                    self._cache_put(cache_key, output)
+                return True, None, {fmt: path for fmt, path in output.items() if fmt in formats}
+            if error:
+                self.logger.warning(f"Server transcription failed: {error}")
+
         # Try direct transcription first
         success, error, output = self._transcribe(
-            video_path, output_dir, language, formats, translate_to_english,
+            video_path, output_dir, language, run_formats, translate_to_english,
             max_length, split_on_word
         )
-        
+
         if success:
-            return True, None, output
-        
-        # Fallback: extract audio and retry
+            if cache_key:
+                self._cache_put(cache_key, output)
+            return True, None, {fmt: path for fmt, path in output.items() if fmt in formats}
+
+        # Fallback: stream extracted audio over a pipe (no temp WAV)
         self.logger.warning(f"Direct transcription failed: {error}")
+        self.logger.info("Falling back to piped audio extraction")
+
+        success, error, output = self._transcribe_piped(
+            video_path, output_dir, language, run_formats, translate_to_english,
+            max_length, split_on_word
+        )
+
+        if success:
+            if cache_key:
+                self._cache_put(cache_key, output)
+            return True, None, {fmt: path for fmt, path in output.items() if fmt in formats}
+
+        # Last resort: temp WAV on disk, for whisper builds without
+        # stdin support
+        self.logger.warning(f"Piped transcription failed: {error}")
         self.logger.info("Falling back to audio extraction")
-        
+
         audio_path = self._extract_audio(video_path, output_dir)
         if not audio_path:
             return False, "Failed to extract audio", {}
         
         success, error, output = self._transcribe(
-            audio_path, output_dir, language, formats, translate_to_english,
+            audio_path, output_dir, language, run_formats, translate_to_english,
             max_length, split_on_word
         )
-        
+
+        if success and cache_key:
+            self._cache_put(cache_key, output)
+        if success:
+            output = {fmt: path for fmt, path in output.items() if fmt in formats}
         return success, error, output
-    
-    def _transcribe(
+
+    def generate_subtitles_batch(
         self,
-        input_path: str,
+        video_paths: List[str],
         output_dir: str,
-        language: str,
-        formats: List[str],
-        translate: bool,
+        language: str = "auto",
+        formats: Optional[List[str]] = None,
+        translate_to_english: bool = False,
         max_length: int = 0,
         split_on_word: bool = False
+    ) -> tuple[bool, Optional[str], Dict[str, Dict[str, str]]]:
+        """
+        Generate subtitles for several files in one whisper.cpp run
+
+        Loading the GGML weights dominates wallclock for short clips on
+        the small models, and the per-file path pays it once per video.
+        whisper.cpp accepts repeated -f arguments, so a batch shares a
+        single model load. Files that produce no output in the batch run
+        are retried through the per-file path (which includes the audio
+        extraction fallback).
+
+        Returns:
+            (success, error_message, {video_path: {format: subtitle_path}})
+        """
+        if not self.available:
+            return False, "whisper.cpp is not installed", {}
+
+        if not self.check_model():
+            return False, f"Model not found: {self.model_path}", {}
+
+        if formats is None:
+            formats = ["srt", "vtt", "txt"]
+
+        # Similar-length files batch well; mixing a 30-second clip with
+        # a full service pads the short one up to the long one's windows
+        # and wastes the compute, so inputs are grouped by duration and
+        # each group shares one whisper.cpp run
+        outputs: Dict[str, Dict[str, str]] = {}
+        error = None
+        for bucket in self._bucket_by_duration(video_paths):
+            ok, err, bucket_outputs = self._transcribe_batch(
+                bucket, output_dir, language, formats, translate_to_english,
+                max_length, split_on_word
+            )
+            outputs.update(bucket_outputs)
+            if not ok:
+                error = err
+
+        # Per-file retry for anything the batch run missed
+        missing = [p for p in video_paths if not outputs.get(p)]
+        for video_path in missing:
+            self.logger.warning(f"Batch run produced no output for {video_path}, retrying individually")
+            ok, err, files = self.generate_subtitles(
+                video_path, output_dir, language, formats,
+                translate_to_english, max_length, split_on_word
+            )
+            if ok:
+                outputs[video_path] = files
+            else:
+                error = err
+
+        if any(outputs.values()):
+            return True, None, outputs
+        return False, error or "No output files generated", outputs
+
+    def _ensure_server(self) -> Optional[str]:
+        """Start whisper-server once and return its URL; None if unusable
+
+        Loading the GGML weights dominates short transcriptions; the
+        server pays it once and then answers over HTTP. The process is
+        spawned lazily on first use, bound to a free loopback port, and
+        torn down at interpreter exit. A missing binary or a server
+        that never comes up marks the path failed so later calls skip
+        straight to the subprocess route.
+        """
+        if self._server_url is not None:
+            return self._server_url
+        if self._server_failed:
+            return None
+
+        server_bin = shutil.which('whisper-server')
+        if not server_bin:
+            self._server_failed = True
+            return None
+
+        try:
+            # Bind to port 0 to have the kernel pick a free port
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+                probe.bind(('127.0.0.1', 0))
+                port = probe.getsockname()[1]
+
+            self.logger.info(f"Starting whisper-server on port {port}")
+            self._server_proc = subprocess.Popen(
+                [
+                    server_bin,
+                    "-m", self.model_path_str,
+                    "--host", "127.0.0.1",
+                    "--port", str(port),
+                    "-t", str(self.n_threads)
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+            atexit.register(self._stop_server)
+
+            # Wait out the model load until the port accepts
+            deadline = time.monotonic() + 60
+            while time.monotonic() < deadline:
+                if self._server_proc.poll() is not None:
+                    break
+                try:
+                    with socket.create_connection(('127.0.0.1', port), timeout=1):
+                        self._server_url = f"http://127.0.0.1:{port}"
+                        return self._server_url
+                except OSError:
+                    time.sleep(0.25)
+
+            self.logger.warning("whisper-server did not come up, falling back")
+            self._stop_server()
+        except OSError as e:
+            self.logger.warning(f"Failed to start whisper-server: {e}")
+
+        self._server_failed = True
+        return None
+
+    def _stop_server(self):
+        """Terminate the managed whisper-server, if running"""
+        proc = self._server_proc
+        self._server_proc = None
+        self._server_url = None
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    def _transcribe_server(
+        self,
+        video_path: str,
+        output_dir: str,
+        language: str,
+        formats: List[str],
+        translate: bool
     ) -> tuple[bool, Optional[str], Dict[str, str]]:
-        """Transcribe audio/video file"""
+        """Transcribe through the resident whisper-server
+
+        One JSON request per file — the transcription runs once and
+        srt/vtt/txt are rendered locally from the timed segments, the
+        same way the fingerprint cache re-renders formats. A normalized
+        JSON sidecar is always written so cached runs can render
+        formats that were never requested. max_length/split_on_word are
+        not exposed by the server API, so callers that use them go
+        through the subprocess route.
+        """
+        server_url = self._ensure_server()
+        if server_url is None:
+            return False, None, {}
+
         try:
+            import requests
+
             output_dir_path = Path(output_dir)
             output_dir_path.mkdir(parents=True, exist_ok=True)
-            
-            # Sanitize base name to avoid issues with spaces
-            base_name = Path(input_path).stem.replace(' ', '_')
-            output_files = {}
-            
-            # Build whisper.cpp command
-            cmd = [
-                self.whisper_bin,
-                "-m", str(self.model_path.absolute()),  # Use absolute path
-                "-f", str(Path(input_path).absolute()),  # Use absolute path
-            ]
-            
-            # Set language
+            base_name = os.path.splitext(os.path.basename(video_path))[0].replace(' ', '_')
+
+            # verbose_json carries per-segment timings; plain 'json'
+            # only returns the concatenated text
+            data = {'response_format': 'verbose_json'}
             if language != "auto":
-                cmd.extend(["-l", language])
-            
-            # Translation
+                data['language'] = language
             if translate:
-                cmd.append("-tr")
-            
-            # Subtitle segmentation settings
-            if max_length > 0:
-                cmd.extend(["--max-len", str(max_length)])
-            
-            if split_on_word:
-                cmd.append("-sow")
-            
-            # Output formats
-            format_flags = {
-                'srt': '-osrt',
-                'vtt': '-ovtt',
-                'txt': '-otxt',
-                'json': '-oj'
+                data['translate'] = 'true'
+
+            with open(video_path, 'rb') as f:
+                response = requests.post(
+                    f"{server_url}/inference",
+                    files={'file': f},
+                    data=data,
+                    timeout=3600
+                )
+
+            if response.status_code != 200:
+                return False, f"whisper-server error: {response.status_code} - {response.text[:200]}", {}
+
+            segments = self._parse_server_segments(response.json())
+            if not segments:
+                # No timed segments to render from; let the caller fall
+                # back to the subprocess route
+                return False, "whisper-server returned no timed segments", {}
+
+            # CLI-shaped sidecar so _load_segments (and the cache's
+            # format re-rendering) reads it like any other run
+            json_path = output_dir_path / f"{base_name}.json"
+            with open(json_path, 'w', encoding='utf-8') as out:
+                json.dump({'transcription': [
+                    {'offsets': {'from': start, 'to': end}, 'text': text}
+                    for start, end, text in segments
+                ]}, out, ensure_ascii=False)
+            output_files = {'json': str(json_path)}
+
+            renderers = {
+                'srt': self._segments_to_srt,
+                'vtt': self._segments_to_vtt,
+                'txt': self._segments_to_txt
             }
-            
             for fmt in formats:
-                if fmt in format_flags:
-                    cmd.append(format_flags[fmt])
-            
-            # Add threading options
-            cmd.extend([
-                "-t", "4",  # 4 threads
-                "-p", "1",  # 1 processor
-            ])
-            
-            # Run whisper.cpp
-            self.logger.info(f"Running whisper.cpp: {' '.join(cmd)}")
+                renderer = renderers.get(fmt)
+                if renderer is None:
+                    continue
+                dest = output_dir_path / f"{base_name}.{fmt}"
+                with open(dest, 'w', encoding='utf-8') as out:
+                    out.write(renderer(segments))
+                output_files[fmt] = str(dest)
+
+            return True, None, output_files
+
+        except Exception as e:
+            return False, str(e), {}
+
+    @staticmethod
+    def _parse_server_segments(data) -> List[tuple]:
+        """Normalize a server JSON payload to (start_ms, end_ms, text)
+
+        Accepts both the OpenAI-style shape ('segments' with second
+        floats) and the CLI-style shape ('transcription' with ms
+        offsets) that some builds return.
+        """
+        if not isinstance(data, dict):
+            return []
+        if 'segments' in data:
+            return [
+                (int(seg['start'] * 1000), int(seg['end'] * 1000), seg.get('text', ''))
+                for seg in data['segments']
+            ]
+        if 'transcription' in data:
+            return [
+                (seg['offsets']['from'], seg['offsets']['to'], seg['text'])
+                for seg in data['transcription']
+            ]
+        return []
+
+    def _audio_fingerprint(self, video_path: str) -> Optional[str]:
+        """Hash the first 60s of decoded 16 kHz mono PCM
+
+        Hashing decoded samples rather than the container file means a
+        remux or metadata edit still hits the cache. 60s of 16 kHz
+        16-bit mono is under 2 MB, so the decode and hash cost a few
+        hundred ms against the minutes a transcription takes.
+        """
+        try:
             result = subprocess.run(
-                cmd,
+                [
+                    "ffmpeg", "-v", "error",
+                    "-i", video_path,
+                    "-vn",
+                    "-t", "60",
+                    "-f", "s16le",
+                    "-acodec", "pcm_s16le",
+                    "-ar", "16000",
+                    "-ac", "1",
+                    "-"
+                ],
                 capture_output=True,
+                timeout=120
+            )
+            if result.returncode != 0 or not result.stdout:
+                return None
+            return hashlib.sha256(result.stdout).hexdigest()[:32]
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+
+    def _cache_key(
+        self,
+        video_path: str,
+        language: str,
+        translate: bool,
+        max_length: int,
+        split_on_word: bool
+    ) -> Optional[str]:
+        """Cache key combining audio fingerprint and transcription params"""
+        fingerprint = self._audio_fingerprint(video_path)
+        if fingerprint is None:
+            return None
+        params = f"{self.model_name}:{language}:{int(translate)}:{max_length}:{int(split_on_word)}:{self.vad_model or ''}"
+        return f"{fingerprint}_{hashlib.sha256(params.encode()).hexdigest()[:8]}"
+
+    def _cache_get(
+        self,
+        cache_key: str,
+        formats: List[str],
+        video_path: str,
+        output_dir: str
+    ) -> Optional[Dict[str, str]]:
+        """Serve cached subtitles, rendering missing formats from JSON
+
+        A format that was never requested before does not force a
+        re-transcription: the cached JSON transcript carries the
+        timestamps and text, so srt/vtt/txt are synthesized from it in
+        microseconds and stored back into the cache.
+        """
+        entries = {fmt: self.cache_dir / f"{cache_key}.{fmt}" for fmt in formats}
+
+        missing = [fmt for fmt, path in entries.items() if not path.exists()]
+        if missing:
+            json_path = self.cache_dir / f"{cache_key}.json"
+            if not json_path.exists():
+                return None
+            try:
+                segments = self._load_segments(json_path)
+            except (OSError, ValueError, KeyError, TypeError):
+                return None
+
+            converters = {
+                'srt': self._segments_to_srt,
+                'vtt': self._segments_to_vtt,
+                'txt': self._segments_to_txt
+            }
+            for fmt in missing:
+                render = converters.get(fmt)
+                if render is None:
+                    return None
+                entries[fmt].write_text(render(segments), encoding='utf-8')
+            self.logger.info(f"Rendered {missing} from cached JSON transcript")
+
+        try:
+            output_dir_path = Path(output_dir)
+            output_dir_path.mkdir(parents=True, exist_ok=True)
+            base_name = os.path.splitext(os.path.basename(video_path))[0].replace(' ', '_')
+
+            output_files = {}
+            for fmt, cached_path in entries.items():
+                dest = output_dir_path / f"{base_name}.{fmt}"
+                shutil.copy2(cached_path, dest)
+                output_files[fmt] = str(dest)
+            return output_files
+        except OSError as e:
+            self.logger.warning(f"Subtitle cache read failed: {e}")
+            return None
+
+    @staticmethod
+    def _load_segments(json_path: Path) -> List[tuple]:
+        """Read (start_ms, end_ms, text) segments from whisper JSON output"""
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return [
+            (seg['offsets']['from'], seg['offsets']['to'], seg['text'])
+            for seg in data['transcription']
+        ]
+
+    @staticmethod
+    def _format_timestamp(ms: int, separator: str = ',') -> str:
+        hours, remainder = divmod(ms, 3600000)
+        minutes, remainder = divmod(remainder, 60000)
+        seconds, millis = divmod(remainder, 1000)
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{millis:03d}"
+
+    @classmethod
+    def _segments_to_srt(cls, segments: List[tuple]) -> str:
+        blocks = []
+        for index, (start, end, text) in enumerate(segments, 1):
+            blocks.append(
+                f"{index}\n"
+                f"{cls._format_timestamp(start)} --> {cls._format_timestamp(end)}\n"
+                f"{text.strip()}\n"
+            )
+        return '\n'.join(blocks)
+
+    @classmethod
+    def _segments_to_vtt(cls, segments: List[tuple]) -> str:
+        blocks = ["WEBVTT\n"]
+        for start, end, text in segments:
+            blocks.append(
+                f"{cls._format_timestamp(start, '.')} --> {cls._format_timestamp(end, '.')}\n"
+                f"{text.strip()}\n"
+            )
+        return '\n'.join(blocks)
+
+    @staticmethod
+    def _segments_to_txt(segments: List[tuple]) -> str:
+        return '\n'.join(text.strip() for _, _, text in segments) + '\n'
+
+    def _cache_put(self, cache_key: str, output_files: Dict[str, str]):
+        """Store generated subtitles under the fingerprint key"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for fmt, path in output_files.items():
+                shutil.copy2(path, self.cache_dir / f"{cache_key}.{fmt}")
+        except OSError as e:
+            self.logger.warning(f"Subtitle cache write failed: {e}")
+
+    def _option_flags(
+        self,
+        language: str,
+        formats: List[str],
+        translate: bool,
+        max_length: int,
+        split_on_word: bool
+    ) -> List[str]:
+        """Build the whisper.cpp flags shared by all invocation paths"""
+        flags = []
+
+        # Set language
+        if language != "auto":
+            flags.extend(["-l", language])
+
+        # Translation
+        if translate:
+            flags.append("-tr")
+
+        # Subtitle segmentation settings
+        if max_length > 0:
+            flags.extend(["--max-len", str(max_length)])
+
+        if split_on_word:
+            flags.append("-sow")
+
+        # Output formats
+        format_flags = {
+            'srt': '-osrt',
+            'vtt': '-ovtt',
+            'txt': '-otxt',
+            'json': '-oj'
+        }
+
+        for fmt in formats:
+            if fmt in format_flags:
+                flags.append(format_flags[fmt])
+
+        # Voice activity detection: whisper.cpp only runs the encoder
+        # on voiced windows, skipping silence and music
+        if self.vad_model:
+            flags.extend([
+                "--vad",
+                "--vad-model", self.vad_model,
+                "--vad-threshold", "0.5"
+            ])
+
+        # Add threading options
+        flags.extend([
+            "-t", str(self.n_threads),
+            "-p", "1",  # 1 processor
+        ])
+
+        return flags
+
+    @staticmethod
+    def _default_threads() -> int:
+        """Thread count matched to the CPUs this process may use
+
+        The old hardcoded -t 4 underused 8+ core boxes and
+        oversubscribed 2-core ones. sched_getaffinity respects cgroup
+        and taskset limits where os.cpu_count does not; the cap at 8
+        reflects whisper.cpp's diminishing returns past that.
+        """
+        if hasattr(os, 'sched_getaffinity'):
+            cpus = len(os.sched_getaffinity(0))
+        else:
+            cpus = os.cpu_count() or 4
+        return max(1, min(cpus, 8))
+
+    def _transcribe_piped(
+        self,
+        video_path: str,
+        output_dir: str,
+        language: str,
+        formats: List[str],
+        translate: bool,
+        max_length: int = 0,
+        split_on_word: bool = False
+    ) -> tuple[bool, Optional[str], Dict[str, str]]:
+        """Stream ffmpeg-decoded audio straight into whisper.cpp
+
+        The temp-WAV fallback writes the full 16 kHz mono track to disk
+        and whisper.cpp immediately reads it back — double the disk
+        traffic for a pass-through step. Here ffmpeg's stdout feeds
+        whisper.cpp's stdin over a pipe, so the audio never touches
+        disk; -of pins the output base name that stdin input cannot
+        provide. Older whisper builds without stdin support fail here
+        and the caller falls back to the temp-WAV path.
+        """
+        try:
+            output_dir_path = Path(output_dir)
+            output_dir_path.mkdir(parents=True, exist_ok=True)
+
+            base_name = os.path.splitext(os.path.basename(video_path))[0].replace(' ', '_')
+
+            ffmpeg_cmd = ["ffmpeg"]
+            if self.low_latency:
+                ffmpeg_cmd.extend(self._LOW_LATENCY_FLAGS)
+            ffmpeg_cmd.extend([
+                "-i", video_path,
+                "-vn",  # No video
+                "-f", "wav",
+                "-acodec", "pcm_s16le",  # 16-bit PCM
+                "-ar", "16000",  # 16kHz sample rate (whisper requirement)
+                "-ac", "1",  # Mono
+                "-"
+            ])
+
+            whisper_cmd = [
+                self.whisper_bin,
+                "-m", self.model_path_str,
+                "-f", "-",
+                "-of", base_name
+            ]
+            whisper_cmd.extend(self._option_flags(
+                language, formats, translate, max_length, split_on_word
+            ))
+
+            self.logger.info("Piping ffmpeg audio into whisper.cpp")
+            extractor = subprocess.Popen(
+                ffmpeg_cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+            try:
+                # Widen the pipe from the 64 KiB default so ffmpeg is
+                # not stalled waiting on whisper.cpp reads
+                import fcntl
+                fcntl.fcntl(extractor.stdout.fileno(), fcntl.F_SETPIPE_SZ, 1 << 20)
+            except (ImportError, AttributeError, OSError):
+                pass
+
+            transcriber = subprocess.Popen(
+                whisper_cmd,
+                stdin=extractor.stdout,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=3600,  # 1 hour timeout
                 cwd=output_dir_path
             )
-            
-            if result.returncode != 0:
-                self.logger.error(f"whisper.cpp failed: {result.stderr}")
-                return False, f"whisper.cpp error: {result.stderr[:200]}", {}
-            
-            # Collect output files
-            # whisper.cpp outputs files based on the input filename
-            # For example: input.wav.srt, input.wav.vtt
-            input_filename = Path(input_path).name
-            
+            # Let the transcriber see EOF when ffmpeg exits
+            extractor.stdout.close()
+
+            try:
+                _, stderr = transcriber.communicate(timeout=3600)
+            finally:
+                extractor.wait()
+
+            if transcriber.returncode != 0:
+                return False, f"whisper.cpp error: {(stderr or '')[:200]}", {}
+
+            output_files = {}
+            existing_names = {entry.name for entry in os.scandir(output_dir_path)}
             for fmt in formats:
-                # Try different possible output names
-                possible_names = [
-                    output_dir_path / f"{input_filename}.{fmt}",  # audio.wav.srt
-                    output_dir_path / f"{base_name}.{fmt}",       # audio.srt
-                    output_dir_path / Path(input_path).name.replace(Path(input_path).suffix, f".{fmt}"),  # audio.srt (without .wav)
-                ]
-                
-                for output_path in possible_names:
-                    if output_path.exists():
-                        output_files[fmt] = str(output_path)
-                        self.logger.info(f"Found {fmt} file: {output_path}")
-                        break
-            
+                name = f"{base_name}.{fmt}"
+                if name in existing_names:
+                    output_files[fmt] = str(output_dir_path / name)
+
             if not output_files:
+                return False, "No output files generated", {}
+
+            return True, None, output_files
+
+        except subprocess.TimeoutExpired:
+            return False, "Transcription timeout (>1 hour)", {}
+
+        except Exception as e:
+            self.logger.error(f"Piped transcription error: {e}")
+            return False, str(e), {}
+
+    def _probe_duration(self, path: str) -> Optional[float]:
+        """Read media duration in seconds via ffprobe; None on failure"""
+        try:
+            result = subprocess.run(
+                [
+                    "ffprobe", "-v", "error",
+                    "-show_entries", "format=duration",
+                    "-of", "csv=p=0",
+                    path
+                ],
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+            if result.returncode == 0:
+                return float(result.stdout.strip())
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            pass
+        return None
+
+    def _bucket_by_duration(self, paths: List[str], bucket_sec: float = 60.0):
+        """Yield groups of inputs with similar durations
+
+        Sorted ascending by ffprobe duration and split whenever the
+        spread within a group would exceed bucket_sec. Files whose
+        duration cannot be probed form their own trailing group.
+        """
+        if len(paths) < 2:
+            yield list(paths)
+            return
+
+        durations = [(path, self._probe_duration(path)) for path in paths]
+        unknown = [path for path, duration in durations if duration is None]
+        known = sorted(
+            (pair for pair in durations if pair[1] is not None),
+            key=lambda pair: pair[1]
+        )
+
+        bucket: List[str] = []
+        bucket_start = 0.0
+        for path, duration in known:
+            if bucket and duration - bucket_start > bucket_sec:
+                yield bucket
+                bucket = []
+            if not bucket:
+                bucket_start = duration
+            bucket.append(path)
+        if bucket:
+            yield bucket
+        if unknown:
+            yield unknown
+
+    def _transcribe(
+        self,
+        input_path: str,
+        output_dir: str,
+        language: str,
+        formats: List[str],
+        translate: bool,
+        max_length: int = 0,
+        split_on_word: bool = False
+    ) -> tuple[bool, Optional[str], Dict[str, str]]:
+        """Transcribe a single audio/video file"""
+        success, error, outputs = self._transcribe_batch(
+            [input_path], output_dir, language, formats, translate,
+            max_length, split_on_word
+        )
+        return success, error, outputs.get(input_path, {})
+
+    def _transcribe_batch(
+        self,
+        input_paths: List[str],
+        output_dir: str,
+        language: str,
+        formats: List[str],
+        translate: bool,
+        max_length: int = 0,
+        split_on_word: bool = False
+    ) -> tuple[bool, Optional[str], Dict[str, Dict[str, str]]]:
+        """Transcribe one or more files with a single whisper.cpp run"""
+        try:
+            output_dir_path = Path(output_dir)
+            output_dir_path.mkdir(parents=True, exist_ok=True)
+
+            cmd = self._build_batch_cmd(
+                input_paths, language, formats, translate, max_length, split_on_word
+            )
+
+            # Run whisper.cpp. Stdout is dropped and stderr drained
+            # into a bounded deque by a reader thread: capture_output
+            # buffered the full progress stream in memory (whisper.cpp
+            # logs per segment, so hours of audio meant megabytes of
+            # text) and only the tail matters for error reporting.
+            self.logger.info(f"Running whisper.cpp: {' '.join(cmd)}")
+            tail: deque = deque(maxlen=200)
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                cwd=output_dir_path
+            )
+            reader = threading.Thread(
+                target=tail.extend, args=(proc.stderr,), daemon=True
+            )
+            reader.start()
+            try:
+                proc.wait(timeout=3600 * len(input_paths))  # 1 hour per file
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+                raise
+            reader.join()
+
+            if proc.returncode != 0:
+                error_text = ''.join(tail)
+                self.logger.error(f"whisper.cpp failed: {error_text}")
+                return False, f"whisper.cpp error: {error_text[:200]}", {}
+
+            outputs = self._collect_outputs(input_paths, output_dir_path, formats)
+
+            if not any(outputs.values()):
                 # List all files in output directory for debugging
                 all_files = list(output_dir_path.iterdir())
                 self.logger.warning(f"No subtitle files found. Files in output dir: {[f.name for f in all_files]}")
-                return False, "No output files generated", {}
-            
-            self.logger.info(f"Generated subtitles: {list(output_files.keys())}")
-            return True, None, output_files
-        
+                return False, "No output files generated", outputs
+
+            self.logger.info(f"Generated subtitles for {sum(1 for o in outputs.values() if o)} of {len(input_paths)} file(s)")
+            return True, None, outputs
+
         except subprocess.TimeoutExpired:
             return False, "Transcription timeout (>1 hour)", {}
-        
+
         except Exception as e:
             self.logger.error(f"Transcription error: {e}")
             return False, str(e), {}
+
+    def _build_batch_cmd(
+        self,
+        input_paths: List[str],
+        language: str,
+        formats: List[str],
+        translate: bool,
+        max_length: int,
+        split_on_word: bool
+    ) -> List[str]:
+        """Assemble the whisper.cpp command for a batch of inputs
+
+        One -f per input amortizes the model load across the batch.
+        """
+        cmd = [
+            self.whisper_bin,
+            "-m", self.model_path_str,
+        ]
+        for input_path in input_paths:
+            cmd.extend(["-f", os.path.abspath(input_path)])
+        cmd.extend(self._option_flags(
+            language, formats, translate, max_length, split_on_word
+        ))
+        return cmd
+
+    def _collect_outputs(
+        self,
+        input_paths: List[str],
+        output_dir_path: Path,
+        formats: List[str]
+    ) -> Dict[str, Dict[str, str]]:
+        """Map each input to the subtitle files whisper.cpp produced
+
+        whisper.cpp outputs files based on the input filename, e.g.
+        input.wav.srt or input.srt. One scandir replaces up to three
+        exists() stats per format.
+        """
+        existing_names = {entry.name for entry in os.scandir(output_dir_path)}
+        outputs: Dict[str, Dict[str, str]] = {}
+        out_dir = str(output_dir_path)
+
+        for input_path in input_paths:
+            input_filename = os.path.basename(input_path)
+            root = os.path.splitext(input_filename)[0]
+            # Sanitize base name to avoid issues with spaces
+            base_name = root.replace(' ', '_')
+            output_files = {}
+
+            for fmt in formats:
+                # Try different possible output names; plain string
+                # candidates against the scandir set — no Path objects
+                # or stat calls in the probe loop
+                for name in (
+                    f"{input_filename}.{fmt}",  # audio.wav.srt
+                    f"{base_name}.{fmt}",       # audio.srt
+                    f"{root}.{fmt}",            # audio.srt (without .wav)
+                ):
+                    if name in existing_names:
+                        output_path = os.path.join(out_dir, name)
+                        output_files[fmt] = output_path
+                        self.logger.info(f"Found {fmt} file: {output_path}")
+                        break
+
+            outputs[input_path] = output_files
+
+        return outputs
     
+    async def _transcribe_batch_async(
+        self,
+        input_paths: List[str],
+        output_dir: str,
+        language: str,
+        formats: List[str],
+        translate: bool,
+        max_length: int = 0,
+        split_on_word: bool = False
+    ) -> tuple[bool, Optional[str], Dict[str, Dict[str, str]]]:
+        """Async counterpart of _transcribe_batch
+
+        Uses an asyncio subprocess so a producer can keep several
+        whisper.cpp runs in flight without tying up a thread per job;
+        command construction and output collection are shared with the
+        sync path.
+        """
+        try:
+            output_dir_path = Path(output_dir)
+            output_dir_path.mkdir(parents=True, exist_ok=True)
+
+            cmd = self._build_batch_cmd(
+                input_paths, language, formats, translate, max_length, split_on_word
+            )
+
+            self.logger.info(f"Running whisper.cpp: {' '.join(cmd)}")
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=str(output_dir_path)
+            )
+            try:
+                _, stderr = await asyncio.wait_for(
+                    proc.communicate(), timeout=3600 * len(input_paths)
+                )
+            except asyncio.TimeoutError:
+                proc.kill()
+                return False, "Transcription timeout (>1 hour)", {}
+
+            if proc.returncode != 0:
+                error_text = (stderr or b'').decode(errors='replace')
+                self.logger.error(f"whisper.cpp failed: {error_text}")
+                return False, f"whisper.cpp error: {error_text[:200]}", {}
+
+            outputs = self._collect_outputs(input_paths, output_dir_path, formats)
+
+            if not any(outputs.values()):
+                return False, "No output files generated", outputs
+
+            return True, None, outputs
+
+        except Exception as e:
+            self.logger.error(f"Transcription error: {e}")
+            return False, str(e), {}
+
+    async def generate_many(
+        self,
+        jobs: List[Dict],
+        max_concurrency: int = 2
+    ) -> List[tuple[bool, Optional[str], Dict[str, str]]]:
+        """Run several transcription jobs with bounded concurrency
+
+        Each job is a dict with at least video_path and output_dir,
+        plus any generate_subtitles keyword. A semaphore caps how many
+        whisper.cpp processes run at once — two interleaves extraction
+        I/O with compute on one box without oversubscribing the CPU.
+        Results come back in job order.
+        """
+        if not self.available:
+            return [(False, "whisper.cpp is not installed", {})] * len(jobs)
+
+        if not self.check_model():
+            return [(False, f"Model not found: {self.model_path}", {})] * len(jobs)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(job: Dict) -> tuple[bool, Optional[str], Dict[str, str]]:
+            async with semaphore:
+                video_path = job['video_path']
+                success, error, outputs = await self._transcribe_batch_async(
+                    [video_path],
+                    job['output_dir'],
+                    job.get('language', 'auto'),
+                    job.get('formats') or ["srt", "vtt", "txt"],
+                    job.get('translate_to_english', False),
+                    job.get('max_length', 0),
+                    job.get('split_on_word', False)
+                )
+                return success, error, outputs.get(video_path, {})
+
+        return list(await asyncio.gather(*(run(job) for job in jobs)))
+
+    def generate_subtitles_many(
+        self,
+        jobs: List[Dict],
+        max_concurrency: int = 2
+    ) -> List[tuple[bool, Optional[str], Dict[str, str]]]:
+        """Sync wrapper around generate_many for non-async callers"""
+        return asyncio.run(self.generate_many(jobs, max_concurrency))
+
     def _extract_audio(self, video_path: str, output_dir: str) -> Optional[str]:
         """Extract audio from video using ffmpeg"""
         try:
             # Sanitize filename to avoid issues with spaces
-            stem = Path(video_path).stem.replace(' ', '_')
+            stem = os.path.splitext(os.path.basename(video_path))[0].replace(' ', '_')
             audio_path = Path(output_dir) / f"{stem}_audio.wav"
             
-            cmd = [
-                "ffmpeg",
+            cmd = ["ffmpeg"]
+            if self.low_latency:
+                cmd.extend(self._LOW_LATENCY_FLAGS)
+            cmd.extend([
                 "-i", video_path,
                 "-vn",  # No video
                 "-acodec", "pcm_s16le",  # 16-bit PCM
@@ -303,7 +1257,7 @@ class WhisperCppEngine:
                 "-ac", "1",  # Mono
                 "-y",  # Overwrite
                 str(audio_path)
-            ]
+            ])
             
             self.logger.info("Extracting audio with ffmpeg")
             result = subprocess.run(
@@ -334,7 +1288,7 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='Subtitle Generation (whisper.cpp)')
-    parser.add_argument('--video', required=True, help='Input video path')
+    parser.add_argument('--video', required=True, nargs='+', help='Input video path(s); several share one model load')
     parser.add_argument('--output-dir', required=True, help='Output directory')
     parser.add_argument('--model', default='base', 
                        choices=WhisperCppEngine.list_available_models(),
@@ -353,18 +1307,31 @@ def main():
         models_dir=args.models_dir
     )
     
-    success, error, output_files = engine.generate_subtitles(
-        args.video,
-        args.output_dir,
-        args.language,
-        args.formats,
-        args.translate
-    )
-    
+    if len(args.video) == 1:
+        success, error, output_files = engine.generate_subtitles(
+            args.video[0],
+            args.output_dir,
+            args.language,
+            args.formats,
+            args.translate
+        )
+        results = {args.video[0]: output_files}
+    else:
+        success, error, results = engine.generate_subtitles_batch(
+            args.video,
+            args.output_dir,
+            args.language,
+            args.formats,
+            args.translate
+        )
+
     if success:
         print("✓ Subtitles generated:")
-        for fmt, path in output_files.items():
-            print(f"  {fmt}: {path}")
+        for video, output_files in results.items():
+            if len(results) > 1:
+                print(f"  {video}:")
+            for fmt, path in output_files.items():
+                print(f"  {fmt}: {path}")
     else:
         print(f"✗ Failed: {error}")
 
@@ -3,15 +3,28 @@
 Test script for AI Content Processing module
 """
 
+import functools
 import sys
 import requests
 from pathlib import Path
 
+# One keep-alive session shared by every test: each bare requests.get
+# paid a fresh TCP handshake to the same local endpoint
+SESSION = requests.Session()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_processor(model=None):
+    """Build (once per model) the shared AIContentProcessor"""
+    from modules.content.ai_processor import AIContentProcessor
+    return AIContentProcessor(model=model) if model else AIContentProcessor()
+
+
 def test_ollama_connection():
     """Test if Ollama service is available"""
     print("Testing Ollama connection...")
     try:
-        response = requests.get('http://localhost:11434/api/tags', timeout=5)
+        response = SESSION.get('http://localhost:11434/api/tags', timeout=5)
         if response.status_code == 200:
             models = response.json().get('models', [])
             print(f"✓ Ollama is running")
@@ -31,7 +44,7 @@ def test_recommended_model():
     """Check if recommended model is available"""
     print("\nChecking recommended model...")
     try:
-        response = requests.get('http://localhost:11434/api/tags', timeout=5)
+        response = SESSION.get('http://localhost:11434/api/tags', timeout=5)
         if response.status_code == 200:
             models = response.json().get('models', [])
             model_names = [m.get('name') for m in models]
@@ -64,7 +77,7 @@ def test_ai_processor_initialization():
     print("\nTesting AI processor initialization...")
     try:
         from modules.content.ai_processor import AIContentProcessor
-        processor = AIContentProcessor(model="qwen2.5:latest")
+        processor = _get_processor(model="qwen2.5:latest")
         print("✓ AIContentProcessor initialized successfully")
         
         # Test Ollama availability check
@@ -91,7 +104,7 @@ def test_simple_prompt():
     print("\nTesting simple AI prompt...")
     try:
         from modules.content.ai_processor import AIContentProcessor
-        processor = AIContentProcessor(model="qwen2.5:latest")
+        processor = _get_processor(model="qwen2.5:latest")
         
         test_prompt = "Say 'Hello, CMAS!' in a friendly way."
         print(f"  Sending test prompt: {test_prompt}")
@@ -128,7 +141,7 @@ This is a test subtitle
         test_file = Path("test_subtitle.srt")
         test_file.write_text(test_srt)
         
-        processor = AIContentProcessor()
+        processor = _get_processor()
         subtitles = processor._parse_srt(str(test_file))
         
         test_file.unlink()  # Clean up
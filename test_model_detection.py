@@ -9,11 +9,15 @@ from pathlib import Path
 
 API_BASE = "http://localhost:5001/api"
 
+# One keep-alive session shared by every test: each bare requests.get
+# paid a fresh TCP handshake to the same local endpoint
+SESSION = requests.Session()
+
 def test_whisper_models():
     """Test Whisper model detection"""
     print("Testing Whisper model detection...")
     try:
-        response = requests.get(f"{API_BASE}/models/whisper", timeout=5)
+        response = SESSION.get(f"{API_BASE}/models/whisper", timeout=5)
         
         if response.status_code == 200:
             data = response.json()
@@ -47,7 +51,7 @@ def test_ollama_models():
     """Test Ollama model detection"""
     print("\nTesting Ollama model detection...")
     try:
-        response = requests.get(f"{API_BASE}/models/ollama", timeout=5)
+        response = SESSION.get(f"{API_BASE}/models/ollama", timeout=5)
         
         if response.status_code == 200:
             data = response.json()
@@ -10,8 +10,9 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from modules.subtitles.engine_whispercpp import WhisperCppEngine
-from modules.thumbnail.composer_pillow import ThumbnailComposer
+# Module imports are deferred into the tests that need them: pulling in
+# WhisperCppEngine / ThumbnailComposer here loads PIL and yaml even for
+# runs that never touch them, which dominates short invocations
 
 
 def test_subtitle_engine():
@@ -19,7 +20,9 @@ def test_subtitle_engine():
     print("\n" + "="*60)
     print("测试字幕生成引擎")
     print("="*60)
-    
+
+    from modules.subtitles.engine_whispercpp import WhisperCppEngine
+
     engine = WhisperCppEngine(model="base")
     
     print(f"✓ whisper.cpp 可用: {engine.available}")
@@ -46,7 +49,9 @@ def test_thumbnail_composer():
     print("\n" + "="*60)
     print("测试缩略图合成器")
     print("="*60)
-    
+
+    from modules.thumbnail.composer_pillow import ThumbnailComposer
+
     composer = ThumbnailComposer()
     
     # 创建测试输出目录
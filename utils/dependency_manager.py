@@ -7,6 +7,7 @@ import sys
 import platform
 import subprocess
 import logging
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -69,9 +70,19 @@ class DependencyManager:
         }
     }
     
+    # Dependencies rarely change between requests; cache check_all() results
+    # for this long before re-probing with subprocess calls
+    CHECK_ALL_TTL = 30.0
+
+    # Per-dependency probes get a shorter TTL so /api/dependencies/{key}
+    # polls stay O(1) without going long out of date
+    CHECK_DEP_TTL = 15.0
+
     def __init__(self):
         self.logger = self._setup_logger()
         self.os_type = self._detect_os()
+        self._check_all_cache = None  # (monotonic timestamp, results)
+        self._dep_cache = {}  # (dep_key, custom_path) -> (timestamp, result)
     
     def _setup_logger(self) -> logging.Logger:
         logger = logging.getLogger("DependencyManager")
@@ -121,17 +132,37 @@ class DependencyManager:
         
         return custom_paths
     
-    def check_dependency(self, dep_key: str, custom_path: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+    def check_dependency(self, dep_key: str, custom_path: Optional[str] = None,
+                         force: bool = False) -> Tuple[bool, Optional[str]]:
         """
-        Check if a dependency is installed
-        
+        Check if a dependency is installed (cached for CHECK_DEP_TTL seconds)
+
         Args:
             dep_key: Dependency key
             custom_path: Optional custom path to check first
-        
+            force: Bypass the per-dependency cache
+
         Returns:
             (is_installed, version_or_path)
         """
+        cache_key = (dep_key, custom_path)
+        if not force:
+            cached = self._dep_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < self.CHECK_DEP_TTL:
+                return cached[1]
+
+        result = self._probe_dependency(dep_key, custom_path)
+        self._dep_cache[cache_key] = (time.monotonic(), result)
+        return result
+
+    def invalidate_dependency(self, dep_key: str) -> None:
+        """Drop cached probe results after an install or path change"""
+        for cache_key in [k for k in self._dep_cache if k[0] == dep_key]:
+            self._dep_cache.pop(cache_key, None)
+        self._check_all_cache = None
+
+    def _probe_dependency(self, dep_key: str, custom_path: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """Uncached probe behind check_dependency"""
         dep = self.DEPENDENCIES.get(dep_key)
         if not dep:
             return False, None
@@ -189,10 +220,21 @@ class DependencyManager:
             pass
         return {}
     
-    def check_all(self) -> Dict[str, Dict]:
-        """Check all dependencies"""
+    def check_all(self, force: bool = False) -> Dict[str, Dict]:
+        """
+        Check all dependencies
+
+        Args:
+            force: Bypass the TTL cache and re-probe (use after installs
+                   or configuration changes)
+        """
+        if not force and self._check_all_cache:
+            cached_at, cached_results = self._check_all_cache
+            if time.monotonic() - cached_at < self.CHECK_ALL_TTL:
+                return cached_results
+
         results = {}
-        
+
         # Load custom paths from config
         custom_paths = self._load_custom_paths()
         
@@ -206,7 +248,8 @@ class DependencyManager:
                 'installed': is_installed,
                 'version': version
             }
-        
+
+        self._check_all_cache = (time.monotonic(), results)
         return results
     
     def get_install_command(self, dep_key: str) -> Optional[str]:
@@ -276,8 +319,8 @@ class DependencyManager:
                 self.logger.info("Running post-installation steps...")
                 subprocess.run(dep['post_install'], shell=True)
             
-            # Verify installation
-            is_installed, version = self.check_dependency(dep_key)
+            # Verify installation (bypass the probe cache)
+            is_installed, version = self.check_dependency(dep_key, force=True)
             if is_installed:
                 self.logger.info(f"✓ {dep['name']} installed successfully")
                 return True
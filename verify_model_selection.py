@@ -4,6 +4,7 @@
 """
 
 import json
+import os
 from pathlib import Path
 
 print("🔍 验证语言和模型选择功能")
@@ -13,11 +14,18 @@ print("=" * 60)
 models_dir = Path("../whisper.cpp/models")
 if models_dir.exists():
     print("\n📦 已下载的Whisper模型:")
-    model_files = sorted(models_dir.glob("ggml-*.bin"))
+    # One scandir pass: DirEntry.stat() reuses the metadata fetched
+    # with the directory listing instead of a separate stat per file
+    with os.scandir(models_dir) as it:
+        model_files = sorted(
+            (e for e in it
+             if e.name.startswith("ggml-") and e.name.endswith(".bin")
+             and "for-tests" not in e.name),
+            key=lambda e: e.name
+        )
     for model_file in model_files:
-        if "for-tests" not in model_file.name:
-            size_mb = model_file.stat().st_size / (1024 * 1024)
-            print(f"  ✓ {model_file.name:<25} ({size_mb:.1f} MB)")
+        size_mb = model_file.stat().st_size / (1024 * 1024)
+        print(f"  ✓ {model_file.name:<25} ({size_mb:.1f} MB)")
     
     if not model_files:
         print("  ⚠️  没有找到模型文件")